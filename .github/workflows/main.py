@@ -1,8 +1,8 @@
 import os
+import sys
 import matplotlib
 # 1. 強制設定後台繪圖 (最優先)
 matplotlib.use('Agg') 
-import requests
 import yfinance as yf
 import mplfinance as mpf
 import pandas as pd
@@ -15,8 +15,13 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from datetime import datetime, timedelta
 
+# 共用連線池 / HTTP 快取在專案根目錄
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import http_cache
+
 # --- 0. 設定 ---
 API_KEY = os.environ.get("POLYGON_API_KEY")
+NEWS_TTL = 600   # 新聞 10 分鐘內直接用本機快取，之後用 ETag / Last-Modified 重新驗證
 
 # --- 1. 觀察清單 ---
 SECTORS = {
@@ -34,7 +39,7 @@ def get_polygon_news():
     news_html = ""
     try:
         url = f"https://api.polygon.io/v2/reference/news?limit=12&order=desc&sort=published_utc&apiKey={API_KEY}"
-        resp = requests.get(url, timeout=10)
+        resp = http_cache.get(url, ttl=NEWS_TTL, timeout=10)
         data = resp.json()
         if data.get('results'):
             for item in data['results']:
@@ -51,8 +56,8 @@ def get_polygon_news():
 def get_market_condition():
     try:
         print("🔍 Checking Market...")
-        spy = yf.Ticker("SPY").history(period="6mo")
-        qqq = yf.Ticker("QQQ").history(period="6mo")
+        spy = yf.Ticker("SPY", session=http_cache.yf_session()).history(period="6mo")
+        qqq = yf.Ticker("QQQ", session=http_cache.yf_session()).history(period="6mo")
         
         if spy.empty or qqq.empty: return "NEUTRAL", "數據不足", 0
 
@@ -72,7 +77,7 @@ def get_market_condition():
 # --- 4. 數據獲取 ---
 def fetch_data_safe(ticker, period, interval):
     try:
-        dat = yf.Ticker(ticker).history(period=period, interval=interval)
+        dat = yf.Ticker(ticker, session=http_cache.yf_session()).history(period=period, interval=interval)
         if dat is None or dat.empty: return None
         if not isinstance(dat.index, pd.DatetimeIndex): dat.index = pd.to_datetime(dat.index)
         dat = dat.rename(columns={"Open": "Open", "High": "High", "Low": "Low", "Close": "Close", "Volume": "Volume"})
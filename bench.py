@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+# --- 設定 ---
+HERE = os.path.dirname(os.path.abspath(__file__))
+RUNS = 5
+TOP = 12
+
+# 要量測的冷啟動情境 (每次都是全新的 Python 行程)
+SCENARIOS = {
+    "import main": "import main",
+    "main + provider": "import main; main._load_provider()",
+    "main + charts": "import main; main._load_chart_stack()",
+    "main + all": "import main; main._load_provider(); main._load_chart_stack()",
+}
+
+def cold_start(code, runs=RUNS):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True, capture_output=True)
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+def import_profile(code):
+    # python -X importtime 輸出到 stderr：「import time: self [us] | cumulative | imported package」
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=HERE, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line: continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        rows.append((int(cum_us), int(self_us), name.strip(), depth))
+    return rows
+
+def direct_imports(rows, module):
+    # importtime 先印子模組再印父模組：往回找到縮排比 module 深一層的就是它直接 import 的套件
+    idx = next((i for i, r in enumerate(rows) if r[2] == module), None)
+    if idx is None: return [], 0
+    depth = rows[idx][3]
+    children = []
+    for r in reversed(rows[:idx]):
+        if r[3] <= depth: break
+        if r[3] == depth + 2: children.append(r)
+    children.sort(reverse=True)
+    return children, rows[idx][0]
+
+def main():
+    ap = argparse.ArgumentParser(description="冷啟動 / import 耗時量測")
+    ap.add_argument("--runs", type=int, default=RUNS)
+    ap.add_argument("--top", type=int, default=TOP)
+    args = ap.parse_args()
+
+    print("⏱️ 冷啟動時間 (中位數，含直譯器啟動)")
+    print("-" * 50)
+    base = cold_start("pass", args.runs)
+    print(f"{'python -c pass':<24} {base:>8.1f} ms")
+    for label, code in SCENARIOS.items():
+        ms = cold_start(code, args.runs)
+        print(f"{label:<24} {ms:>8.1f} ms  (+{ms - base:.1f})")
+
+    for label in ("import main", "main + all"):
+        rows = import_profile(SCENARIOS[label])
+        children, main_us = direct_imports(rows, "main")
+        # 延遲載入的套件是在 import main 之後才載入，會出現在最上層
+        min_depth = min(r[3] for r in rows)
+        lazy = [r for r in rows if r[3] == min_depth and r[2] not in ("main", "site") and not r[2].startswith("encodings")]
+        top = sorted(children + lazy, reverse=True)[:args.top]
+        total = main_us + sum(r[0] for r in lazy)
+        print()
+        print(f"📦 -X importtime: {label} (總計 {total/1000:.1f} ms)")
+        print("-" * 50)
+        for cum, _, name, _ in top:
+            print(f"{name:<30} {cum/1000:>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+from glob import glob
+import pandas as pd
+
+# pyarrow 為選用套件：沒有安裝時改寫 csv，讀回時再依 schema 還原型別
+# 在寫檔 / 讀檔時才載入 (不拖慢 main.py 啟動，--json 也用不到)
+
+# --- 設定 ---
+# 放在部署根目錄 (不在 .cache 裡)：GitHub Pages 會連同頁面一起發布 exports/，
+# workflow 每次執行前先從 gh-pages 取回舊的分區，所以歷史會一直累積在 gh-pages 上
+# notebook / dashboard：git clone -b gh-pages 後 export.load("analysis", out_dir="<clone>/exports")
+EXPORT_DIR = "exports"
+
+# 固定 schema：每次執行的檔案型別一致，整個目錄可以直接當成一個資料集讀取
+ANALYSIS_SCHEMA = {
+    "ticker": "string", "signal": "string", "score": "int16",
+    "price": "float64", "rr": "float64", "rvol": "float64", "perf_30d": "float64",
+    "strategies": "int8", "entry": "float64", "sl": "float64", "tp": "float64",
+    "found_fvg": "bool", "found_sweep": "bool", "is_bullish": "bool",
+    "ssl_sweeps": "string", "bsl_sweeps": "string",
+}
+SCANNER_SCHEMA = {
+    "ticker": "string", "price": "float64", "change_pct": "float64", "rvol": "float64",
+    "trend": "string", "score": "int16", "sma50": "float64", "volume": "float64",
+    "passed": "bool", "hot": "bool",
+}
+SCHEMAS = {"analysis": ANALYSIS_SCHEMA, "scanner": SCANNER_SCHEMA}
+
+# --- 1. 轉成欄位表 ---
+def _cell(v):
+    # list 欄位 (例如被掃的視窗 [10, 20]) 存成 "10/20"
+    return "/".join(map(str, v)) if isinstance(v, (list, tuple)) else v
+
+def to_frame(rows, schema, run_time):
+    # rows: dict list (多出的欄位忽略，缺的欄位補 NA)；run_time: datetime (UTC)
+    df = pd.DataFrame([{k: _cell(r.get(k)) for k in schema} for r in rows], columns=list(schema))
+    df = df.astype(schema)
+    df.insert(0, "run_time", pd.Series(pd.Timestamp(run_time), index=df.index).dt.tz_convert("UTC"))
+    return df
+
+# --- 2. 依執行日期分區寫檔 ---
+def write_frame(df, source, run_time, out_dir=EXPORT_DIR):
+    # hive 風格分區：{out_dir}/{source}/run_date=YYYY-MM-DD/HHMMSS.parquet
+    ts = pd.Timestamp(run_time).tz_convert("UTC")
+    part_dir = os.path.join(out_dir, source, f"run_date={ts:%Y-%m-%d}")
+    os.makedirs(part_dir, exist_ok=True)
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        path = os.path.join(part_dir, f"{ts:%H%M%S}.csv")
+        df.to_csv(path, index=False)
+        print(f"⚠️ 未安裝 pyarrow，改輸出 csv: {path}")
+        return path
+    path = os.path.join(part_dir, f"{ts:%H%M%S}.parquet")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, compression="zstd")
+    return path
+
+def export_results(rows, source, schema, run_time, out_dir=EXPORT_DIR):
+    if not rows: return None
+    return write_frame(to_frame(rows, schema, run_time), source, run_time, out_dir)
+
+# --- 3. 讀回 (notebook / dashboard 用) ---
+def _read_csv(path, schema):
+    # csv 備援檔：字串欄位的空值還原成 ""，時間還原成 UTC
+    strings = [k for k, v in schema.items() if v == "string"]
+    df = pd.read_csv(path, dtype={k: str for k in strings})
+    df[strings] = df[strings].fillna("")
+    df['run_time'] = pd.to_datetime(df['run_time'], utc=True)
+    return df.astype(schema)
+
+def load(source, out_dir=EXPORT_DIR, since=None):
+    # since: "YYYY-MM-DD"，只讀這天 (含) 之後的分區；parquet 與 csv 備援檔都讀
+    schema = SCHEMAS.get(source, {})
+    frames = []
+    for part in sorted(glob(os.path.join(out_dir, source, "run_date=*"))):
+        run_date = os.path.basename(part).split("=", 1)[1]
+        if since and run_date < since: continue
+        for path in sorted(glob(os.path.join(part, "*.parquet"))):
+            frames.append(pd.read_parquet(path).assign(run_date=run_date))
+        for path in sorted(glob(os.path.join(part, "*.csv"))):
+            frames.append(_read_csv(path, schema).assign(run_date=run_date))
+    if not frames: return pd.DataFrame(columns=["run_time", *schema, "run_date"])
+    return pd.concat(frames, ignore_index=True).sort_values("run_time", kind="stable", ignore_index=True)
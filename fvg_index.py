@@ -0,0 +1,122 @@
+import bisect
+import numpy as np
+
+# 公平價值缺口 (FVG) 索引：整段歷史一次建好，之後新K線進來只做增量更新
+#   多頭缺口：Low[i] > High[i-2]，區間 [High[i-2], Low[i]]；之後任一根 Low <= 上緣 即視為已回補 (mitigated)
+#   空頭缺口：High[i] < Low[i-2]，區間 [High[i], Low[i-2]]；之後任一根 High >= 下緣 即視為已回補
+# 未回補的缺口依「靠近現價的那一側邊緣」排序 (多頭按上緣、空頭按下緣)：
+# 回補 = 從排序串列的一端整段切掉，查詢「現價下方的缺口 / 最近的缺口」都是 bisect，O(log n)
+
+BULL, BEAR = 1, -1
+
+class FVGIndex:
+    def __init__(self, high=None, low=None):
+        # 每個缺口一筆 (位置 = 缺口編號)；created / mitigated 為K線序號 (從 0 開始累計)，未回補為 -1
+        self.kind, self.bottom, self.top, self.created, self.mitigated = [], [], [], [], []
+        self.n = 0                              # 已處理的K線數
+        self._h, self._l = [], []               # 最近 3 根的高 / 低 (增量偵測 + 修正最後一根用)
+        self._bull_keys, self._bull_ids = [], []
+        self._bear_keys, self._bear_ids = [], []
+        if high is not None: self.extend(high, low)
+
+    @classmethod
+    def from_df(cls, df):
+        return cls(df['High'].to_numpy(dtype=float), df['Low'].to_numpy(dtype=float))
+
+    def __len__(self):
+        return len(self.kind)
+
+    # --- 1. 建立 / 更新 ---
+    def _add(self, pos, kind, bottom, top):
+        gid = len(self.kind)
+        self.kind.append(kind); self.bottom.append(bottom); self.top.append(top)
+        self.created.append(pos); self.mitigated.append(-1)
+        keys, ids = (self._bull_keys, self._bull_ids) if kind == BULL else (self._bear_keys, self._bear_ids)
+        key = top if kind == BULL else bottom
+        i = bisect.bisect_right(keys, key)
+        keys.insert(i, key)
+        ids.insert(i, gid)
+
+    def _mitigate(self, pos, high, low):
+        if low == low and self._bull_keys:
+            i = bisect.bisect_left(self._bull_keys, low)       # 上緣 >= 這根低點的多頭缺口全部回補
+            for gid in self._bull_ids[i:]: self.mitigated[gid] = pos
+            del self._bull_keys[i:], self._bull_ids[i:]
+        if high == high and self._bear_keys:
+            i = bisect.bisect_right(self._bear_keys, high)     # 下緣 <= 這根高點的空頭缺口全部回補
+            for gid in self._bear_ids[:i]: self.mitigated[gid] = pos
+            del self._bear_keys[:i], self._bear_ids[:i]
+
+    def extend(self, high, low):
+        high, low = np.asarray(high, dtype=float), np.asarray(low, dtype=float)
+        if not len(high): return self
+        start = len(self._h)
+        h = np.concatenate((np.asarray(self._h, dtype=float), high))
+        l = np.concatenate((np.asarray(self._l, dtype=float), low))
+        off = self.n - start                    # h[0] 的K線序號
+
+        # 缺口偵測一次向量化完成，逐根迴圈只負責回補 (每根一次 bisect)
+        with np.errstate(invalid="ignore"):
+            bull = l[2:] > h[:-2]
+            bear = h[2:] < l[:-2]
+        new = {}
+        for k in np.flatnonzero(bull) + 2:
+            if k >= start: new[k] = (BULL, float(h[k - 2]), float(l[k]))
+        for k in np.flatnonzero(bear) + 2:
+            if k >= start: new[k] = (BEAR, float(h[k]), float(l[k - 2]))
+
+        # 先用這根K線回補舊缺口，再加入這根建立的缺口 (建立的那根不算回補)
+        for k in range(start, len(h)):
+            self._mitigate(off + k, h[k], l[k])
+            if k in new: self._add(off + k, *new[k])
+        self.n += len(high)
+        self._h, self._l = h[-3:].tolist(), l[-3:].tolist()
+        return self
+
+    def update(self, high, low):
+        return self.extend([high], [low])
+
+    def revise_last(self, high, low):
+        # 盤中最後一根K線的高低點更新 (高點只會變高、低點只會變低)：撤銷這根建立的缺口後重新判斷
+        if not self.n: return self.update(high, low)
+        pos = self.n - 1
+        if self.created and self.created[-1] == pos and self.mitigated[-1] == -1:
+            kind = self.kind.pop()
+            keys, ids = (self._bull_keys, self._bull_ids) if kind == BULL else (self._bear_keys, self._bear_ids)
+            i = ids.index(len(self.kind))
+            del keys[i], ids[i]
+            self.bottom.pop(); self.top.pop(); self.created.pop(); self.mitigated.pop()
+        self._h[-1], self._l[-1] = float(high), float(low)
+        self._mitigate(pos, high, low)
+        if len(self._h) >= 3:
+            (h2, _, h0), (l2, _, l0) = self._h[-3:], self._l[-3:]
+            if l0 > h2: self._add(pos, BULL, h2, l0)
+            elif h0 < l2: self._add(pos, BEAR, h0, l2)
+        return self
+
+    # --- 2. 查詢 ---
+    def gap(self, gid):
+        return {"id": gid, "kind": self.kind[gid], "bottom": self.bottom[gid], "top": self.top[gid],
+                "created": self.created[gid], "mitigated": self.mitigated[gid]}
+
+    def open_gaps(self, kind=None):
+        ids = ([] if kind == BEAR else self._bull_ids) + ([] if kind == BULL else self._bear_ids)
+        return [self.gap(g) for g in sorted(ids)]
+
+    def open_below(self, price):
+        # 未回補、上緣 <= price 的多頭缺口，由近到遠
+        i = bisect.bisect_right(self._bull_keys, price)
+        return [self.gap(g) for g in reversed(self._bull_ids[:i])]
+
+    def open_above(self, price):
+        # 未回補、下緣 >= price 的空頭缺口，由近到遠
+        i = bisect.bisect_left(self._bear_keys, price)
+        return [self.gap(g) for g in self._bear_ids[i:]]
+
+    def nearest(self, price, kind=BULL):
+        # 邊緣 (多頭上緣 / 空頭下緣) 最接近 price 的未回補缺口
+        keys, ids = (self._bull_keys, self._bull_ids) if kind == BULL else (self._bear_keys, self._bear_ids)
+        if not keys: return None
+        i = bisect.bisect_left(keys, price)
+        cand = [j for j in (i - 1, i) if 0 <= j < len(keys)]
+        return self.gap(ids[min(cand, key=lambda j: abs(keys[j] - price))])
@@ -0,0 +1,104 @@
+import os
+import sys
+import sqlite3
+import argparse
+
+# --- 設定 ---
+DB_PATH = os.path.join(".cache", "history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_time TEXT PRIMARY KEY,
+    market TEXT,
+    market_bonus INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_time TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    signal TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    price REAL, rvol REAL, rr REAL, perf_30d REAL,
+    entry REAL, sl REAL, tp REAL,
+    found_fvg INTEGER, found_sweep INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_results_ticker_time ON results (ticker, run_time);
+CREATE INDEX IF NOT EXISTS idx_results_time_score ON results (run_time, score);
+"""
+
+COLUMNS = ("ticker", "signal", "score", "price", "rvol", "rr", "perf_30d", "entry", "sl", "tp", "found_fvg", "found_sweep")
+
+# --- 1. 寫入 ---
+def connect(path=DB_PATH):
+    if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def _value(v):
+    # numpy 型別 / NaN 轉成 sqlite 認得的值
+    if v is None or isinstance(v, str): return v
+    v = float(v)
+    return None if v != v else v
+
+def record_run(conn, run_time, results, market=None, market_bonus=None):
+    # results: analyze_ticker() 回傳的 dict list；單一交易 + executemany 批次寫入
+    rows = [(run_time,) + tuple(_value(r.get(c)) for c in COLUMNS) for r in results]
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?)", (run_time, market, market_bonus))
+        conn.execute("DELETE FROM results WHERE run_time = ?", (run_time,))
+        conn.executemany(f"INSERT INTO results (run_time, {', '.join(COLUMNS)}) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})", rows)
+    return len(rows)
+
+# --- 2. 查詢 ---
+def run_times(conn, limit=2):
+    return [r[0] for r in conn.execute("SELECT run_time FROM runs ORDER BY run_time DESC LIMIT ?", (limit,))]
+
+def new_longs(conn):
+    # 最新一次是 LONG、但上一次不是 LONG (或上一次沒有出現) 的股票
+    runs = run_times(conn, 2)
+    if not runs: return []
+    if len(runs) == 1:
+        return [r[0] for r in conn.execute("SELECT ticker FROM results WHERE run_time = ? AND signal = 'LONG' ORDER BY score DESC", (runs[0],))]
+    return [r[0] for r in conn.execute(
+        """SELECT cur.ticker FROM results cur
+           LEFT JOIN results prev ON prev.ticker = cur.ticker AND prev.run_time = ?
+           WHERE cur.run_time = ? AND cur.signal = 'LONG' AND (prev.signal IS NULL OR prev.signal != 'LONG')
+           ORDER BY cur.score DESC""", (runs[1], runs[0]))]
+
+def score_trend(conn, ticker, n=30):
+    rows = conn.execute("SELECT run_time, score, signal FROM results WHERE ticker = ? ORDER BY run_time DESC LIMIT ?", (ticker, n)).fetchall()
+    return rows[::-1]
+
+def top_scores(conn, limit=20, run_time=None):
+    run_time = run_time or next(iter(run_times(conn, 1)), None)
+    if run_time is None: return []
+    return conn.execute("SELECT ticker, score, signal, rvol FROM results WHERE run_time = ? ORDER BY score DESC LIMIT ?", (run_time, limit)).fetchall()
+
+# --- 3. 命令列 ---
+def main():
+    ap = argparse.ArgumentParser(description="查詢歷次執行的訊號 / 評分紀錄")
+    ap.add_argument("--db", default=DB_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("new-longs", help="上次之後新出現的 LONG")
+    p = sub.add_parser("trend", help="單一股票的評分走勢")
+    p.add_argument("ticker")
+    p.add_argument("-n", type=int, default=30)
+    p = sub.add_parser("top", help="最新一次評分排行")
+    p.add_argument("-n", type=int, default=20)
+    args = ap.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ 找不到 {args.db}")
+        sys.exit(1)
+    conn = connect(args.db)
+    if args.cmd == "new-longs":
+        for t in new_longs(conn): print(t)
+    elif args.cmd == "trend":
+        for run_time, score, signal in score_trend(conn, args.ticker.upper(), args.n):
+            print(f"{run_time}  {score:>3}  {signal}")
+    elif args.cmd == "top":
+        for ticker, score, signal, rvol in top_scores(conn, args.n):
+            print(f"{ticker:<8} {score:>3}  {signal:<5} Vol {rvol or 0:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+import re
+import time
+import pickle
+import hashlib
+import threading
+from email.utils import formatdate
+
+# 共用 HTTP 連線層：
+#   1. 全程式共用一個 requests.Session (keep-alive 連線池 + 失敗重試)，不再每次 requests.get 重新建立連線
+#   2. 磁碟回應快取：TTL 內直接讀本機；過期後帶 If-None-Match / If-Modified-Since 重新驗證，304 就沿用本機內容
+# requests 在第一次用到時才載入 (不拖慢 main.py 啟動)
+
+# --- 設定 ---
+CACHE_DIR = os.path.join(".cache", "http")
+DEFAULT_TTL = 300          # 秒；伺服器有給 Cache-Control: max-age 時以伺服器為準
+POOL_SIZE = 8
+RETRIES = 2
+TIMEOUT = 10
+
+STATS = {"hit": 0, "revalidated": 0, "miss": 0, "stale": 0}
+
+_session = None
+_yf_session = False        # False = 還沒建立；None = yfinance 不接受共用 session
+_lock = threading.RLock()
+
+# --- 1. 連線池 ---
+def get_session():
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            retry = Retry(total=RETRIES, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET", "HEAD"))
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            s = requests.Session()
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+    return _session
+
+def yf_session():
+    # yfinance 新版只接受 curl_cffi 的 session (也不接受有快取的 session)：不支援時回傳 None，讓 yfinance 用自己的
+    global _yf_session
+    with _lock:
+        if _yf_session is False:
+            try:
+                from curl_cffi import requests as cffi
+                s = cffi.Session(impersonate="chrome")
+            except ImportError:
+                s = get_session()
+            try:
+                from yfinance.data import YfData
+                YfData(session=s)   # 不支援的型別會在這裡丟例外
+            except Exception as e:
+                print(f"⚠️ yfinance 不接受共用 session，改用預設: {e}")
+                s = None
+            _yf_session = s
+    return _yf_session
+
+# --- 2. 回應快取 ---
+class CachedResponse:
+    def __init__(self, status_code, headers, content, url, from_cache=False):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        import json
+        return json.loads(self.content)
+
+def _cache_path(url, params, cache_dir):
+    key = url if not params else url + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pkl")
+
+def _load(path):
+    try:
+        with open(path, "rb") as f: return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+def _save(path, entry):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f: pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️ HTTP 快取寫入失敗: {e}")
+
+def _max_age(headers):
+    # Cache-Control: no-store → 不快取 (-1)；no-cache → 每次都重新驗證 (0)；max-age=N → N 秒；沒給 → None
+    cc = headers.get("Cache-Control", "").lower()
+    if "no-store" in cc: return -1
+    if "no-cache" in cc: return 0
+    m = re.search(r"max-age=(\d+)", cc)
+    return int(m.group(1)) if m else None
+
+def get(url, params=None, ttl=None, timeout=TIMEOUT, headers=None, cache_dir=CACHE_DIR):
+    # ttl=None：依伺服器 Cache-Control，沒給就用 DEFAULT_TTL；網路失敗時有舊資料就回傳舊資料
+    import requests
+    path = _cache_path(url, params, cache_dir)
+    entry = _load(path)
+    now = time.time()
+    if entry is not None and now - entry['stored'] < (entry['ttl'] if ttl is None else ttl):
+        STATS['hit'] += 1
+        return CachedResponse(entry['status'], entry['headers'], entry['body'], url, from_cache=True)
+
+    req_headers = dict(headers or {})
+    if entry is not None:
+        if entry['headers'].get("ETag"): req_headers["If-None-Match"] = entry['headers']["ETag"]
+        if entry['headers'].get("Last-Modified"): req_headers["If-Modified-Since"] = entry['headers']["Last-Modified"]
+        elif not entry['headers'].get("ETag"): req_headers["If-Modified-Since"] = formatdate(entry['stored'], usegmt=True)
+    try:
+        resp = get_session().get(url, params=params, headers=req_headers, timeout=timeout)
+    except requests.RequestException:
+        if entry is None: raise
+        STATS['stale'] += 1
+        return CachedResponse(entry['status'], entry['headers'], entry['body'], url, from_cache=True)
+
+    age = _max_age(resp.headers)
+    fresh_for = ttl if ttl is not None else (age if age is not None else DEFAULT_TTL)
+    if resp.status_code == 304 and entry is not None:
+        # 內容沒變：沿用本機內容，更新存放時間 (與伺服器新給的驗證標頭)
+        STATS['revalidated'] += 1
+        for h in ("ETag", "Last-Modified", "Cache-Control"):
+            if h in resp.headers: entry['headers'][h] = resp.headers[h]
+        entry['stored'], entry['ttl'] = now, max(fresh_for, 0)
+        _save(path, entry)
+        return CachedResponse(entry['status'], entry['headers'], entry['body'], url, from_cache=True)
+
+    STATS['miss'] += 1
+    keep = {h: resp.headers[h] for h in ("Content-Type", "ETag", "Last-Modified", "Cache-Control") if h in resp.headers}
+    if resp.status_code == 200 and age != -1:
+        _save(path, {"stored": now, "ttl": max(fresh_for, 0), "status": 200, "headers": keep, "body": resp.content})
+    return CachedResponse(resp.status_code, keep, resp.content, url)
+
+def report():
+    if any(STATS.values()):
+        print(f"🌐 HTTP 快取: 命中 {STATS['hit']} / 304 驗證 {STATS['revalidated']} / 下載 {STATS['miss']} / 離線舊資料 {STATS['stale']}")
@@ -0,0 +1,101 @@
+import numpy as np
+
+# 流動性價位索引：對整段 High / Low 建一次 sparse table，任意區間的最高 / 最低都是 O(1)
+# 10 / 20 / 50 / 100 根的 BSL / SSL、擺動高低點都直接查表，不必對每個視窗重新掃描資料
+
+# --- 設定 ---
+SWEEP_WINDOWS = (10, 20, 50, 100)
+SWEEP_BARS = 3          # 最近幾根K線內發生的掃單才算 (與 calculate_smc 相同)
+
+# --- 1. Sparse table ---
+class SparseTable:
+    # levels[k][i] = op(values[i : i + 2**k])；op 用 fmax / fmin，NaN 會被忽略
+    def __init__(self, values, op):
+        self.op = op
+        self.levels = [np.asarray(values, dtype=float)]
+        k = 1
+        while 2 ** k <= len(self.levels[0]):
+            prev, half = self.levels[-1], 2 ** (k - 1)
+            self.levels.append(op(prev[:-half], prev[half:]))
+            k += 1
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    def query(self, lo, hi):
+        # 區間 [lo, hi)，兩個重疊的 2**k 區塊合併
+        lo, hi = max(lo, 0), min(hi, len(self))
+        if hi <= lo: return np.nan
+        k = (hi - lo).bit_length() - 1
+        row = self.levels[k]
+        return float(self.op(row[lo], row[hi - 2 ** k]))
+
+    def query_many(self, lo, hi):
+        # lo / hi 為等長陣列，一次回傳所有區間的結果 (區間需非空)
+        lo = np.clip(np.asarray(lo), 0, len(self))
+        hi = np.clip(np.asarray(hi), 0, len(self))
+        k = np.floor(np.log2(np.maximum(hi - lo, 1))).astype(int)
+        out = np.full(len(lo), np.nan)
+        for kk in np.unique(k[hi > lo]):
+            sel = (k == kk) & (hi > lo)
+            row = self.levels[kk]
+            out[sel] = self.op(row[lo[sel]], row[hi[sel] - 2 ** kk])
+        return out
+
+# --- 2. 流動性索引 ---
+class LiquidityIndex:
+    def __init__(self, high, low, close):
+        self.close = np.asarray(close, dtype=float)
+        self.highs = SparseTable(high, np.fmax)
+        self.lows = SparseTable(low, np.fmin)
+        self.n = len(self.close)
+
+    @classmethod
+    def from_df(cls, df):
+        return cls(df['High'].to_numpy(dtype=float), df['Low'].to_numpy(dtype=float), df['Close'].to_numpy(dtype=float))
+
+    def high(self, lo, hi):
+        return self.highs.query(lo, hi)
+
+    def low(self, lo, hi):
+        return self.lows.query(lo, hi)
+
+    def bsl(self, window, end=None):
+        # 買方流動性：end 之前 window 根的最高點
+        end = self.n if end is None else end
+        return self.high(end - window, end)
+
+    def ssl(self, window, end=None):
+        # 賣方流動性：end 之前 window 根的最低點
+        end = self.n if end is None else end
+        return self.low(end - window, end)
+
+    def swing_highs(self, lookback):
+        # 左右各 lookback 根內的最高點 (右側不足 lookback 根的還不算確認)
+        idx = np.arange(lookback, self.n - lookback)
+        if not len(idx): return idx
+        peak = self.highs.query_many(idx - lookback, idx + lookback + 1)
+        return idx[self.highs.levels[0][idx] == peak]
+
+    def swing_lows(self, lookback):
+        idx = np.arange(lookback, self.n - lookback)
+        if not len(idx): return idx
+        trough = self.lows.query_many(idx - lookback, idx + lookback + 1)
+        return idx[self.lows.levels[0][idx] == trough]
+
+    def sweeps(self, windows=SWEEP_WINDOWS, bars=SWEEP_BARS):
+        # 最近 bars 根內刺破前 window 根的低點 (SSL) 但收回其上 = 多方掃單；高點 (BSL) 反之
+        # 回傳 {"ssl": [被掃的視窗...], "bsl": [...], "levels": {window: (ssl, bsl)}}
+        end = self.n - bars
+        out = {"ssl": [], "bsl": [], "levels": {}}
+        if end <= 0: return out
+        lows = self.lows.levels[0][end:]
+        highs = self.highs.levels[0][end:]
+        closes = self.close[end:]
+        for w in windows:
+            if end < w: continue
+            ssl, bsl = self.ssl(w, end), self.bsl(w, end)
+            out["levels"][w] = (ssl, bsl)
+            if ((lows < ssl) & (closes > ssl)).any(): out["ssl"].append(w)
+            if ((highs > bsl) & (closes < bsl)).any(): out["bsl"].append(w)
+        return out
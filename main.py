@@ -1,19 +1,52 @@
 import os
-import matplotlib
-# 1. 強制設定後台繪圖 (最優先)
-matplotlib.use('Agg') 
-import requests
-import yfinance as yf
-import mplfinance as mpf
+import sys
 import pandas as pd
 import numpy as np
 import base64
 import json
 import time
+import gzip
+import math
+import argparse
+import contextlib
 from io import BytesIO
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import market_calendar
+import resample
+import history
+import export
+import http_cache
+import scoring
+from sparkline import sparkline_svg
+from fvg_index import FVGIndex, BULL
+from liquidity import LiquidityIndex
+from pipeline import Pipeline, Stage, Dependency
+
+# 重型套件延遲載入：matplotlib / mplfinance 只在真的要畫圖時才載入，yfinance 只在要抓數據時才載入
+plt = patches = mpf = yf = None
+
+def _load_chart_stack():
+    global plt, patches, mpf
+    if plt is not None: return
+    import matplotlib
+    # 強制設定後台繪圖 (必須在 pyplot 之前)
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as _plt
+    import matplotlib.patches as _patches
+    import mplfinance as _mpf
+    plt, patches, mpf = _plt, _patches, _mpf
+
+def _load_provider():
+    global yf
+    if yf is not None: return
+    import yfinance as _yf
+    yf = _yf
+    http_cache.yf_session()   # 所有 yfinance 請求共用同一個連線池
 
 # --- 1. 觀察清單設定 ---
 
@@ -34,14 +67,59 @@ SECTORS = {
     "📉 指數 ETF": ["SPY", "QQQ", "IWM", "TQQQ", "SQQQ"]
 }
 
+# 評分 / SMC 參數 (optimizer.py 會以不同組合覆寫來做參數掃描)
+SCORE_PARAMS = {
+    "rsi_low": 40, "rsi_high": 55, "rsi_overbought": 70,
+    "rvol_high": 1.5, "rvol_mid": 1.1,
+    "rr_high": 3.0, "rr_mid": 2.0,
+    "sweep_bonus": 20, "sniper_dist": 0.01,
+    "smc_window": 50,
+}
+
+# 輸出設定：STOCK_DATA 依板塊拆成 data/p<N>.json，開啟詳情時才載入
+PARTITION_DATA = True
+DATA_DIR = "data"
+
+# 圖表編碼設定 (深色平面主題顏色少，調色盤量化後體積大幅縮小)
+CHART_ENCODE = {
+    "format": "png",        # png / webp
+    "quantize": 64,         # 調色盤顏色數 (0 = 保留全彩 RGBA)
+    "zlib_level": 9,        # PNG zlib 壓縮等級 0-9
+    "webp_quality": 80,     # WebP 品質 (lossless=True 時忽略)
+    "webp_lossless": False,
+    "tight_bbox": False,    # True = bbox_inches='tight' (每張圖重新計算邊界)；False = 固定畫布
+    "dpi": 80,
+    "output": "datauri",    # datauri = 內嵌 base64；file = 直接寫入原始 bytes 到 chart_dir
+    "chart_dir": "charts",
+}
+CHART_STATS = []            # 每張圖的 bytes / 編碼耗時，main() 結束時匯總
+RENDER_CHARTS = True        # --no-charts / --json 時關閉，整個流程不會載入繪圖套件
+
+# 本地K線快取：休市期間 (上次抓取後沒有任何交易時段收盤) 直接使用快取，不發網路請求
+CACHE_DIR = ".cache"
+BAR_CACHE_DIR = os.path.join(CACHE_DIR, "bars")
+LAST_RUN_FILE = os.path.join(CACHE_DIR, "last_run.json")
+
+# 每隻股票只下載一次最細的週期 (1y 的 1h K線)，4h / 日 / 週K 在本地依交易時段重新取樣
+RESAMPLE_FROM_INTRADAY = True
+INTRADAY_PERIOD = "1y"
+HOURLY_CHART_BARS = 150     # 小時圖只需要最近一個月左右
+
+# Pipeline 各階段的 worker 數 (繪圖只能 1 個：pyplot 的全域狀態不是 thread-safe)
+FETCH_WORKERS = 4
+ANALYZE_WORKERS = 2
+CHART_WORKERS = 1
+HTML_WORKERS = 1
+TEMP_SECTOR = "👀 每日快篩 (LONG Only)"
+
 # --- 2. 市場大盤分析 ---
 def get_market_condition():
     try:
         print("🔍 Checking Market...")
-        spy = yf.Ticker("SPY").history(period="6mo")
-        qqq = yf.Ticker("QQQ").history(period="6mo")
+        spy = fetch_data_safe("SPY", "6mo", "1d")
+        qqq = fetch_data_safe("QQQ", "6mo", "1d")
         
-        if spy.empty or qqq.empty: return "NEUTRAL", "數據不足", 0
+        if spy is None or qqq is None: return "NEUTRAL", "數據不足", 0
 
         spy_50 = spy['Close'].rolling(50).mean().iloc[-1]
         spy_curr = spy['Close'].iloc[-1]
@@ -57,14 +135,50 @@ def get_market_condition():
     except: return "NEUTRAL", "Check Failed", 0
 
 # --- 3. 數據獲取 ---
+def _bar_cache_path(ticker, period, interval):
+    return os.path.join(BAR_CACHE_DIR, f"{ticker}_{period}_{interval}.pkl")
+
+def _load_bar_cache(path):
+    try:
+        cached = pd.read_pickle(path)
+        return cached['fetched_at'], cached['df']
+    except Exception:
+        return None, None
+
 def fetch_data_safe(ticker, period, interval):
+    path = _bar_cache_path(ticker, period, interval)
+    fetched_at, cached = _load_bar_cache(path)
+    if cached is not None and not market_calendar.has_new_bar(fetched_at):
+        return cached
     try:
-        dat = yf.Ticker(ticker).history(period=period, interval=interval)
-        if dat is None or dat.empty: return None
+        _load_provider()
+        dat = yf.Ticker(ticker, session=http_cache.yf_session()).history(period=period, interval=interval)
+        if dat is None or dat.empty: return cached
         if not isinstance(dat.index, pd.DatetimeIndex): dat.index = pd.to_datetime(dat.index)
         dat = dat.rename(columns={"Open": "Open", "High": "High", "Low": "Low", "Close": "Close", "Volume": "Volume"})
+        try:
+            os.makedirs(BAR_CACHE_DIR, exist_ok=True)
+            pd.to_pickle({"fetched_at": datetime.now(timezone.utc), "df": dat}, path)
+        except Exception as e:
+            print(f"⚠️ 快取寫入失敗 {ticker}: {e}")
         return dat
-    except: return None
+    except: return cached
+
+def fetch_frames(t):
+    # 回傳 {"1h", "4h", "1d", "1w"} 各週期的K線；小時線抓取失敗時退回直接下載日K
+    if RESAMPLE_FROM_INTRADAY:
+        base = fetch_data_safe(t, INTRADAY_PERIOD, "1h")
+        if base is not None:
+            try:
+                frames = resample.build_timeframes(base)
+                if len(frames['1d']) >= 50:
+                    frames['1h'] = frames['1h'].tail(HOURLY_CHART_BARS)
+                    return frames
+            except Exception as e:
+                print(f"⚠️ 重新取樣失敗 {t}: {e}")
+    df_d = fetch_data_safe(t, "1y", "1d")
+    if df_d is None: return None
+    return {"1d": df_d}
 
 # --- 4. 技術指標 (RSI, RVOL) ---
 def calculate_indicators(df):
@@ -99,77 +213,46 @@ def calculate_indicators(df):
     return rsi, rvol, golden_cross, trend_bullish, perf_30d
 
 # --- 5. 評分系統 ---
-def calculate_quality_score(df, entry, sl, tp, is_bullish, market_bonus, found_sweep, indicators):
-    try:
-        score = 60 + market_bonus
-        reasons = []
-        rsi, rvol, golden_cross, trend, perf_30d = indicators
-        
-        strategies = 0
-        if found_sweep: strategies += 1
-        if golden_cross: strategies += 1
-        if 40 <= rsi.iloc[-1] <= 55: strategies += 1
-        
-        # RR
-        risk = entry - sl
-        reward = tp - entry
-        rr = reward / risk if risk > 0 else 0
-        if rr >= 3.0: 
-            score += 15
-            reasons.append(f"💰 盈虧比極佳 ({rr:.1f}R)")
-        elif rr >= 2.0: 
-            score += 10
-            reasons.append(f"💰 盈虧比優秀 ({rr:.1f}R)")
-
-        # RSI
-        curr_rsi = rsi.iloc[-1]
-        if 40 <= curr_rsi <= 55: 
-            score += 10
-            reasons.append(f"📉 RSI 完美回調 ({int(curr_rsi)})")
-        elif curr_rsi > 70: score -= 15
-
-        # RVOL
-        curr_rvol = rvol.iloc[-1]
-        if curr_rvol > 1.5:
-            score += 10
-            reasons.append(f"🔥 爆量確認 (Vol {curr_rvol:.1f}x)")
-        elif curr_rvol > 1.1: score += 5
-
-        # Sweep
-        if found_sweep:
-            score += 20
-            reasons.append("💧 觸發流動性獵殺 (Sweep)")
-            
-        # Golden Cross
-        if golden_cross:
-            score += 10
-            reasons.append("✨ 出現黃金交叉")
-
-        # Distance
-        close = df['Close'].iloc[-1]
+def score_features(df, entry, sl, tp, market_bonus, found_sweep, indicators):
+    # 單一股票的評分欄位 (scoring.RULES 用到的欄位)
+    rsi, rvol, golden_cross, trend, perf_30d = indicators
+    risk = entry - sl
+    reward = tp - entry
+    rr = reward / risk if risk > 0 else 0
+    close = df['Close'].iloc[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
         dist_pct = abs(close - entry) / entry
-        if dist_pct < 0.01: 
-            score += 15
-            reasons.append("🎯 狙擊入場區")
-            
-        if trend: 
-            score += 5
-            reasons.append("📈 長期趨勢向上")
-
-        if market_bonus > 0: reasons.append("🌍 大盤順風車 (+5)")
-        if market_bonus < 0: reasons.append("🌪️ 逆大盤風險 (-10)")
-
-        # 注意：這裡已經回傳了 rvol.iloc[-1] (這是一個 float 數字)
-        return min(max(int(score), 0), 99), reasons, rr, rvol.iloc[-1], perf_30d, strategies
-    except: return 50, [], 0, 0, 0, 0
+    return {"rr": rr, "rsi": rsi.iloc[-1], "rvol": rvol.iloc[-1], "found_sweep": bool(found_sweep),
+            "golden_cross": bool(golden_cross), "dist_pct": dist_pct, "trend": bool(trend), "market_bonus": market_bonus}
+
+def score_results(results, params=None):
+    # 每隻股票的 score_features 收成欄位陣列，scoring.score_batch 一次算出所有遮罩 (一隻或整批都可以)
+    # 理由字串不在這裡組，只保留規則位元組 res['bits']，要顯示時才由 reasons_for() 解碼
+    p = params or SCORE_PARAMS
+    ok = [r for r in results if r['features'] is not None]
+    if ok:
+        cols = {c: np.array([r['features'][c] for r in ok]) for c in scoring.COLUMNS}
+        scores, bits, strategies = scoring.score_batch(cols, p)
+        for r, score, b, k in zip(ok, scores, bits, strategies):
+            r['score'], r['bits'], r['strategies'] = int(score), int(b), int(k)
+    for r in results:
+        if r['features'] is None: r['score'], r['bits'], r['strategies'] = 50, 0, 0   # 評分數據不足，使用預設分數
+        r['should_plot'] = (r['signal'] == "LONG") or r['found_sweep'] or (r['score'] >= 80)
+    return results
+
+def reasons_for(res):
+    return scoring.decode_reasons(res['bits'], res['features']) if res['features'] is not None else []
 
 # --- 6. SMC 運算 ---
-def calculate_smc(df):
+def calculate_smc(df, params=None, fvg=None, liq=None):
+    # fvg / liq: 與 df 同步的 FVGIndex / LiquidityIndex (整段歷史)；沒有的話只對最近 window 根建立
+    p = params or SCORE_PARAMS
     try:
-        window = 50
+        window = p['smc_window']
         recent = df.tail(window)
-        bsl = float(recent['High'].max())
-        ssl_long = float(recent['Low'].min())
+        if liq is None: liq = LiquidityIndex.from_df(recent)
+        bsl = liq.bsl(window)
+        ssl_long = liq.ssl(window)
         
         eq = (bsl + ssl_long) / 2
         
@@ -177,23 +260,20 @@ def calculate_smc(df):
         found_fvg = False
         found_sweep = False
         
-        last_3 = recent.tail(3)
-        check_low = recent['Low'].iloc[:-3].tail(10).min() 
+        # 最近 3 根刺破前 10 根低點後收回
+        sweep = liq.sweeps((10,))
+        if sweep['ssl']:
+            found_sweep = True
+            best_entry = sweep['levels'][10][0]
         
-        for i in range(len(last_3)):
-            candle = last_3.iloc[i]
-            if candle['Low'] < check_low and candle['Close'] > check_low:
-                found_sweep = True
-                best_entry = check_low 
-                break
-        
-        for i in range(2, len(recent)):
-            if recent['Low'].iloc[i] > recent['High'].iloc[i-2]:
-                fvg = float(recent['Low'].iloc[i])
-                if fvg < eq:
-                    if not found_sweep: best_entry = fvg
-                    found_fvg = True
-                    break
+        # 窗口內建立、尚未回補、且在 EQ 下方的多頭缺口，取上緣最靠近 EQ 的那個
+        # 缺口要用到 i-2 那根，窗口前兩根建立的缺口不算 (與只對窗口建索引的結果一致)
+        if fvg is None: fvg = FVGIndex.from_df(recent)
+        since = fvg.n - window + 2
+        gap = next((g for g in fvg.open_below(eq) if g['created'] >= since and g['top'] < eq), None)
+        if gap is not None:
+            if not found_sweep: best_entry = gap['top']
+            found_fvg = True
                     
         return bsl, ssl_long, eq, best_entry, ssl_long*0.99, found_fvg, found_sweep
     except:
@@ -202,6 +282,7 @@ def calculate_smc(df):
 
 # --- 7. 繪圖核心 ---
 def create_error_image(msg):
+    _load_chart_stack()
     fig, ax = plt.subplots(figsize=(5, 3))
     fig.patch.set_facecolor('#0f172a')
     ax.set_facecolor('#0f172a')
@@ -213,8 +294,59 @@ def create_error_image(msg):
     buf.seek(0)
     return f"data:image/png;base64,{base64.b64encode(buf.read()).decode('utf-8')}"
 
-def generate_chart(df, ticker, title, entry, sl, tp, is_wait, found_sweep):
+def encode_figure(fig, name):
+    from PIL import Image
+    opts = CHART_ENCODE
+    t0 = time.perf_counter()
+    if opts['tight_bbox']:
+        buf = BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight', transparent=True, dpi=opts['dpi'], pil_kwargs={"compress_level": 0})
+        buf.seek(0)
+        img = Image.open(buf).convert("RGBA")
+    else:
+        # 固定畫布：直接取 Agg 的 RGBA 緩衝區，不必先存一次 PNG 再解碼
+        fig.set_dpi(opts['dpi'])
+        fig.patch.set_alpha(0)
+        for ax in fig.axes: ax.patch.set_alpha(0)
+        fig.canvas.draw()
+        img = Image.fromarray(np.asarray(fig.canvas.buffer_rgba()).copy(), "RGBA")
+    plt.close(fig)
+
+    if opts['quantize']:
+        img = img.quantize(colors=opts['quantize'], method=Image.Quantize.FASTOCTREE)
+
+    out = BytesIO()
+    if opts['format'] == "webp":
+        if img.mode == "P": img = img.convert("RGBA")
+        img.save(out, format="WEBP", quality=opts['webp_quality'], lossless=opts['webp_lossless'])
+        ext, mime = "webp", "image/webp"
+    else:
+        img.save(out, format="PNG", compress_level=opts['zlib_level'])
+        ext, mime = "png", "image/png"
+    raw = out.getvalue()
+
+    if opts['output'] == "file":
+        os.makedirs(opts['chart_dir'], exist_ok=True)
+        path = f"{opts['chart_dir']}/{name}.{ext}"
+        with open(path, "wb") as f: f.write(raw)
+        src = path
+    else:
+        src = f"data:{mime};base64,{base64.b64encode(raw).decode('utf-8')}"
+    CHART_STATS.append({"name": name, "bytes": len(raw), "payload": len(src), "ms": (time.perf_counter() - t0) * 1000})
+    return src
+
+def chart_report():
+    if not CHART_STATS: return
+    n = len(CHART_STATS)
+    raw = sum(s['bytes'] for s in CHART_STATS)
+    payload = sum(s['payload'] for s in CHART_STATS)
+    ms = sum(s['ms'] for s in CHART_STATS)
+    print(f"🖼️ {n} 張圖 ({CHART_ENCODE['format']}, quantize={CHART_ENCODE['quantize']}): 平均 {raw/n/1024:.1f} KB/張 (輸出 {payload/n/1024:.1f} KB)，編碼 {ms/n:.1f} ms/張")
+
+def generate_chart(df, ticker, title, entry, sl, tp, is_wait, found_sweep, fvg=None):
+    # fvg: 與 df 同步的 FVGIndex (日K沿用 analyze_ticker 建好的，小時線才在這裡建)
     try:
+        _load_chart_stack()
         plt.close('all')
         if df is None or len(df) < 5: return create_error_image("No Data")
         plot_df = df.tail(60).copy()
@@ -233,16 +365,16 @@ def generate_chart(df, ticker, title, entry, sl, tp, is_wait, found_sweep):
         ax = axlist[0]
         x_min, x_max = ax.get_xlim()
         
-        for i in range(2, len(plot_df)):
-            idx = i - 1
-            if plot_df['Low'].iloc[i] > plot_df['High'].iloc[i-2]: # Bullish
-                bot, top = plot_df['High'].iloc[i-2], plot_df['Low'].iloc[i]
-                rect = patches.Rectangle((idx, bot), x_max - idx, top - bot, linewidth=0, facecolor='#10b981', alpha=0.25)
-                ax.add_patch(rect)
-            elif plot_df['High'].iloc[i] < plot_df['Low'].iloc[i-2]: # Bearish
-                bot, top = plot_df['High'].iloc[i], plot_df['Low'].iloc[i-2]
-                rect = patches.Rectangle((idx, bot), x_max - idx, top - bot, linewidth=0, facecolor='#ef4444', alpha=0.25)
-                ax.add_patch(rect)
+        # 只畫尚未回補的缺口 (回補與否看完整歷史，畫面外建立的缺口從左邊界開始畫)
+        y_min, y_max = ax.get_ylim()
+        shift = len(df) - len(plot_df) + 1
+        if fvg is None: fvg = FVGIndex.from_df(df)
+        for g in fvg.open_gaps():
+            if g['top'] < y_min or g['bottom'] > y_max: continue
+            idx = max(g['created'] - shift, x_min)
+            color = '#10b981' if g['kind'] == BULL else '#ef4444'
+            ax.add_patch(patches.Rectangle((idx, g['bottom']), x_max - idx, g['top'] - g['bottom'], linewidth=0, facecolor=color, alpha=0.25))
+        ax.set_ylim(y_min, y_max)
 
         if found_sweep:
             lowest = plot_df['Low'].min()
@@ -257,142 +389,75 @@ def generate_chart(df, ticker, title, entry, sl, tp, is_wait, found_sweep):
             ax.add_patch(patches.Rectangle((x_min, entry), x_max-x_min, tp-entry, linewidth=0, facecolor='#10b981', alpha=0.1))
             ax.add_patch(patches.Rectangle((x_min, sl), x_max-x_min, entry-sl, linewidth=0, facecolor='#ef4444', alpha=0.1))
 
-        buf = BytesIO()
-        fig.savefig(buf, format='png', bbox_inches='tight', transparent=True, dpi=80)
-        plt.close(fig)
-        buf.seek(0)
-        return f"data:image/png;base64,{base64.b64encode(buf.read()).decode('utf-8')}"
+        return encode_figure(fig, f"{ticker}_{title.replace(' ', '_')}")
     except: return create_error_image("Plot Error")
 
 # --- 8. 單一股票處理 ---
-def process_ticker(t, app_data_dict, market_bonus):
+def analyze_ticker(t, df_d, market_bonus, fvg=None):
+    curr = float(df_d['Close'].iloc[-1])
+    sma200 = float(df_d['Close'].rolling(200).mean().iloc[-1])
+    if pd.isna(sma200): sma200 = curr
+
+    # 每隻股票的日K索引只建一次：SMC 判斷與日K圖共用
+    if fvg is None: fvg = FVGIndex.from_df(df_d)
+    liq = LiquidityIndex.from_df(df_d)
+    bsl, ssl, eq, entry, sl, found_fvg, found_sweep = calculate_smc(df_d, fvg=fvg, liq=liq)
+    sweeps = liq.sweeps()   # 10 / 20 / 50 / 100 根高低點的掃單
+    tp = bsl
+
+    is_bullish = curr > sma200
+    in_discount = curr < eq
+    signal = "LONG" if (is_bullish and in_discount and (found_fvg or found_sweep)) else "WAIT"
+    
+    indicators = calculate_indicators(df_d)
+    
+    # 評分欄位先收起來，分數由 score_results() 算 (score / bits / strategies / should_plot)
     try:
-        time.sleep(0.3)
-        df_d = fetch_data_safe(t, "1y", "1d")
-        if df_d is None or len(df_d) < 50: return None
-        df_h = fetch_data_safe(t, "1mo", "1h")
-        if df_h is None or df_h.empty: df_h = df_d
-
-        curr = float(df_d['Close'].iloc[-1])
-        sma200 = float(df_d['Close'].rolling(200).mean().iloc[-1])
-        if pd.isna(sma200): sma200 = curr
-
-        bsl, ssl, eq, entry, sl, found_fvg, found_sweep = calculate_smc(df_d)
-        tp = bsl
-
-        is_bullish = curr > sma200
-        in_discount = curr < eq
-        signal = "LONG" if (is_bullish and in_discount and (found_fvg or found_sweep)) else "WAIT"
-        
-        indicators = calculate_indicators(df_d)
-        
-        # 🔥🔥🔥 修復重點在此：
-        # calculate_quality_score 回傳的第四個變數，已經是 rvol 數值 (float)
-        # 所以變數名稱直接叫 rvol_val，不要再叫 rvol，避免混淆
-        score, reasons, rr, rvol_val, perf_30d, strategies = calculate_quality_score(df_d, entry, sl, tp, is_bullish, market_bonus, found_sweep, indicators)
-        
-        # ❌ 舊代碼錯誤： rvol_val = rvol.iloc[-1] (這裡會報錯，因為 rvol 已經是數字了)
-        # ✅ 現在已經在上面一行解決了
-
-        is_wait = (signal == "WAIT")
-        should_plot = (signal == "LONG") or found_sweep or (score >= 80)
-        
-        if should_plot:
-            img_d = generate_chart(df_d, t, "Daily SMC", entry, sl, tp, is_wait, found_sweep)
-            img_h = generate_chart(df_h, t, "Hourly Entry", entry, sl, tp, is_wait, found_sweep)
-        else:
-            img_d, img_h = "", ""
-
-        cls = "b-long" if signal == "LONG" else "b-wait"
-        score_color = "#10b981" if score >= 85 else ("#3b82f6" if score >= 70 else "#fbbf24")
-        
-        elite_html = ""
-        if score >= 75 or found_sweep or rvol_val > 1.2 or signal == "LONG":
-            reasons_html = "".join([f"<li>✅ {r}</li>" for r in reasons])
-            confluence_text = ""
-            if strategies >= 2:
-                confluence_text = f"🔥 <b>策略共振：</b> 同時觸發 {strategies} 種訊號，可靠度極高。"
-            sweep_text = ""
-            if found_sweep:
-                sweep_text = "<div style='margin-top:8px; padding:8px; background:rgba(251,191,36,0.1); border-left:3px solid #fbbf24; color:#fcd34d; font-size:0.85rem;'><b>⚠️ 偵測到流動性獵殺 (Sweep)</b></div>"
-            elite_html = f"<div style='background:rgba(16,185,129,0.1); border:1px solid #10b981; padding:12px; border-radius:8px; margin:10px 0;'><div style='font-weight:bold; color:#10b981; margin-bottom:5px;'>💎 AI 分析 (Score {score})</div><div style='font-size:0.85rem; color:#e2e8f0; margin-bottom:8px;'>{confluence_text}</div><ul style='margin:0; padding-left:20px; font-size:0.8rem; color:#d1d5db;'>{reasons_html}</ul>{sweep_text}</div>"
-        
-        if signal == "LONG":
-            ai_html = f"<div class='deploy-box long'><div class='deploy-title'>✅ LONG SETUP</div><div style='display:flex;justify-content:space-between;border-bottom:1px solid #333;padding-bottom:5px;margin-bottom:5px;'><span>🏆 評分: <b style='color:{score_color};font-size:1.1em'>{score}</b></span><span>💰 RR: <b style='color:#10b981'>{rr:.1f}R</b></span></div><div style='font-size:0.8rem; color:#94a3b8; margin-bottom:5px;'>📈 近30日績效: {perf_30d:+.1f}%</div>{elite_html}<ul class='deploy-list' style='margin-top:10px'><li>TP: ${tp:.2f}</li><li>Entry: ${entry:.2f}</li><li>SL: ${sl:.2f}</li></ul></div>"
-        else:
-            reason = "無FVG/Sweep" if (not found_fvg and not found_sweep) else ("逆勢" if not is_bullish else "溢價區")
-            ai_html = f"<div class='deploy-box wait'><div class='deploy-title'>⏳ WAIT</div><div>評分: <b style='color:#94a3b8'>{score}</b></div><ul class='deploy-list'><li>狀態: {reason}</li><li>參考入場: ${entry:.2f}</li></ul></div>"
-            
-        app_data_dict[t] = {"signal": signal, "deploy": ai_html, "img_d": img_d, "img_h": img_h, "score": score, "rvol": rvol_val}
-        
-        return {"ticker": t, "price": curr, "signal": signal, "cls": cls, "score": score, "rvol": rvol_val, "perf": perf_30d}
-    except Exception as e:
-        print(f"Err {t}: {e}")
+        features = score_features(df_d, entry, sl, tp, market_bonus, found_sweep, indicators)
+        rr, rvol_val, perf_30d = features['rr'], features['rvol'], indicators[4]
+    except (IndexError, KeyError, TypeError, ZeroDivisionError) as e:
+        print(f"⚠️ 評分數據不足，使用預設分數: {e}")
+        features, rr, rvol_val, perf_30d = None, 0, 0, 0
+
+    return {"ticker": t, "price": curr, "signal": signal, "features": features, "rr": rr,
+            "rvol": rvol_val, "perf_30d": perf_30d, "entry": entry, "sl": sl, "tp": tp,
+            "found_fvg": found_fvg, "found_sweep": found_sweep, "is_bullish": is_bullish, "fvg_index": fvg,
+            "ssl_sweeps": sweeps['ssl'], "bsl_sweeps": sweeps['bsl'], "spark": sparkline_svg(df_d['Close'].to_numpy())}
+
+def _num(x, nd):
+    # JSON 不接受 NaN / inf，轉成 null
+    try:
+        x = float(x)
+    except (TypeError, ValueError):
         return None
-
-# --- 9. 主程式 ---
-def main():
-    print("🚀 啟動分析程式 (Bug已修復，封面顯示爆量)...")
+    return round(x, nd) if math.isfinite(x) else None
+
+def build_payload(res, img_d, img_h):
+    # 精簡的結構化資料，詳情內容由前端 renderDeploy() 組出 (取代預先組好的 deploy HTML)
+    return {"signal": res['signal'], "score": res['score'], "rvol": _num(res['rvol'], 4),
+            "rr": _num(res['rr'], 1), "perf": _num(res['perf_30d'], 1),
+            "entry": _num(res['entry'], 2), "sl": _num(res['sl'], 2), "tp": _num(res['tp'], 2),
+            "reasons": reasons_for(res) if res['signal'] == "LONG" else [], "strat": res['strategies'],   # 詳情只有 LONG 會列出理由
+            "fvg": int(res['found_fvg']), "sweep": int(res['found_sweep']), "bull": int(res['is_bullish']),
+            "liq": [res['ssl_sweeps'], res['bsl_sweeps']],
+            "img_d": img_d, "img_h": img_h}
+
+def build_card_html(t, data, part=None, spark=""):
+    signal = data['signal']
+    score = data['score']
+    rvol = data.get('rvol') or 0
     
-    market_status, market_text, market_bonus = get_market_condition()
-    market_color = "#10b981" if market_status == "BULLISH" else ("#ef4444" if market_status == "BEARISH" else "#fbbf24")
+    # 🔥 處理卡片顯示的爆量 (全部顯示，爆量變色)
+    if rvol > 1.2:
+        rvol_tag = f"<div style='color:#f472b6;font-weight:bold;margin-top:2px;font-size:0.8rem'>Vol {rvol:.1f}x 🔥</div>"
+    else:
+        rvol_tag = f"<div style='color:#64748b;margin-top:2px;font-size:0.75rem'>Vol {rvol:.1f}x</div>"
     
-    APP_DATA, sector_html_blocks, screener_rows_list = {}, "", []
-
-    # 1. 處理暫時觀察名單
-    if TEMP_WATCHLIST:
-        print(f"🔎 掃描暫時名單 ({len(TEMP_WATCHLIST)} 隻)...")
-        valid_temp_stocks = []
-        for t in TEMP_WATCHLIST:
-            res = process_ticker(t, APP_DATA, market_bonus)
-            if res:
-                if res['signal'] == "WAIT":
-                    if t in APP_DATA: del APP_DATA[t]
-                    print(f"   🗑️ {t} (WAIT) -> 移除")
-                else:
-                    valid_temp_stocks.append(t)
-                    screener_rows_list.append(res)
-                    print(f"   ✨ {t} (LONG) -> 保留")
-        if valid_temp_stocks:
-            SECTORS["👀 每日快篩 (LONG Only)"] = valid_temp_stocks
+    cls = "b-long" if signal == "LONG" else "b-wait"
+    s_color = "#10b981" if score >= 85 else ("#3b82f6" if score >= 70 else "#fbbf24")
     
-    # 2. 處理固定板塊
-    for sector, tickers in SECTORS.items():
-        sector_results = []
-        for t in tickers:
-            if t in APP_DATA:
-                data = APP_DATA[t]
-                res_obj = {'ticker': t, 'score': data['score'], 'signal': data['signal'], 'rvol': data.get('rvol', 0)}
-                sector_results.append(res_obj)
-            else:
-                res = process_ticker(t, APP_DATA, market_bonus)
-                if res:
-                    sector_results.append(res)
-                    if res['signal'] == "LONG":
-                        screener_rows_list.append(res)
-
-        sector_results.sort(key=lambda x: x['score'], reverse=True)
-        
-        cards = ""
-        for item in sector_results:
-            t = item['ticker']
-            if t not in APP_DATA: continue
-            data = APP_DATA[t]
-            signal = data['signal']
-            score = data['score']
-            rvol = data.get('rvol', 0)
-            
-            # 🔥 處理卡片顯示的爆量 (全部顯示，爆量變色)
-            if rvol > 1.2:
-                rvol_tag = f"<div style='color:#f472b6;font-weight:bold;margin-top:2px;font-size:0.8rem'>Vol {rvol:.1f}x 🔥</div>"
-            else:
-                rvol_tag = f"<div style='color:#64748b;margin-top:2px;font-size:0.75rem'>Vol {rvol:.1f}x</div>"
-            
-            cls = "b-long" if signal == "LONG" else "b-wait"
-            s_color = "#10b981" if score >= 85 else ("#3b82f6" if score >= 70 else "#fbbf24")
-            
-            cards += f"""
-            <div class='card' onclick="openModal('{t}')">
+    return f"""
+            <div class='card' onclick="openModal('{t}'{'' if part is None else f', {part}'})">
                 <div class='head'>
                     <div><div class='code'>{t}</div><div style='font-size:0.7rem;color:#666;margin-top:3px'>Score <span style='color:{s_color}'>{score}</span></div></div>
                     <div style='text-align:right'>
@@ -400,10 +465,184 @@ def main():
                         {rvol_tag}
                     </div>
                 </div>
+                {spark}
             </div>
             """
-            
-        if cards: sector_html_blocks += f"<h3 class='sector-title'>{sector}</h3><div class='grid'>{cards}</div>"
+
+# --- 8b. Pipeline：抓取 → 分析 → 繪圖 → HTML 片段 同時進行 ---
+def build_pipeline(memberships, temp_only=()):
+    # memberships: ticker -> 該股票所在的板塊編號 (卡片要知道去哪個 data/p<N>.json 載入詳情)
+    # temp_only: 只在暫時觀察區的股票，WAIT 會從頁面移除，不必畫圖 / 組詳情
+    def fetch(t):
+        time.sleep(0.3)
+        frames = fetch_frames(t)
+        if frames is None or len(frames['1d']) < 50: return None
+        return {"ticker": t, "frames": frames}
+
+    def analyze(item, market):
+        item['res'] = score_results([analyze_ticker(item['ticker'], item['frames']['1d'], market[2])])[0]
+        return item
+
+    def chart(item):
+        t, res, frames = item['ticker'], item['res'], item.pop('frames')
+        if t in temp_only and res['signal'] == "WAIT":
+            item['payload'] = None
+            return item
+        img_d, img_h = "", ""
+        if RENDER_CHARTS and res['should_plot']:
+            df_d = frames['1d']
+            df_h = frames.get('1h')
+            if df_h is None: df_h = fetch_data_safe(t, "1mo", "1h")
+            if df_h is None or df_h.empty: df_h = df_d
+            is_wait = (res['signal'] == "WAIT")
+            img_d = generate_chart(df_d, t, "Daily SMC", res['entry'], res['sl'], res['tp'], is_wait, res['found_sweep'], res['fvg_index'])
+            img_h = generate_chart(df_h, t, "Hourly Entry", res['entry'], res['sl'], res['tp'], is_wait, res['found_sweep'])
+        item['payload'] = build_payload(res, img_d, img_h)
+        return item
+
+    def html(item):
+        t, res, payload = item['ticker'], item['res'], item['payload']
+        item['cards'] = {p: build_card_html(t, payload, p if PARTITION_DATA else None, res['spark']) for p in memberships.get(t, [])} if payload else {}
+        item['row'] = {"ticker": t, "price": res['price'], "signal": res['signal'], "cls": "b-long" if res['signal'] == "LONG" else "b-wait",
+                       "score": res['score'], "rvol": res['rvol'], "perf": res['perf_30d']}
+        return item
+
+    return Pipeline(
+        [Stage("fetch", fetch, workers=FETCH_WORKERS),
+         Stage("analyze", analyze, workers=ANALYZE_WORKERS, requires=("market",)),
+         Stage("chart", chart, workers=CHART_WORKERS),
+         Stage("html", html, workers=HTML_WORKERS)],
+        deps=[Dependency("market", get_market_condition)])
+
+def run_pipeline(memberships, tickers, temp_only=()):
+    # 回傳 ({ticker: item}, (market_status, market_text, market_bonus))
+    pipe = build_pipeline(memberships, temp_only)
+    t0 = time.time()
+    done = {item['ticker']: item for item in pipe.run(tickers)}
+    pipe.report(time.time() - t0)
+    return done, pipe.dep("market")
+
+# --- 9. 輸出 (含預先壓縮的 .gz / .br) ---
+def write_output(path, text):
+    raw = text.encode("utf-8")
+    with open(path, "wb") as f: f.write(raw)
+    with open(path + ".gz", "wb") as f: f.write(gzip.compress(raw, 9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f: f.write(brotli.compress(raw, quality=11))
+    return len(raw)
+
+def write_partitions(partitions):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for name in os.listdir(DATA_DIR):
+        if name.startswith("p") and ".json" in name: os.remove(os.path.join(DATA_DIR, name))
+    total = 0
+    for i, part in partitions.items():
+        total += write_output(os.path.join(DATA_DIR, f"p{i}.json"), json.dumps(part, ensure_ascii=False, separators=(',', ':')))
+    return total
+
+# --- 10. 主程式 ---
+def sector_layout():
+    # 板塊順序固定 (暫時名單的快篩板塊排最後)，卡片在 pipeline 裡就能先決定所屬的資料檔編號
+    # 回傳 (板塊名稱, ticker -> 板塊編號 list, 要掃描的 ticker)
+    sector_names = [s for s in SECTORS if s != TEMP_SECTOR] + ([TEMP_SECTOR] if TEMP_WATCHLIST else [])
+    memberships = {}
+    for idx, sector in enumerate(sector_names):
+        for t in (TEMP_WATCHLIST if sector == TEMP_SECTOR else SECTORS[sector]):
+            memberships.setdefault(t, []).append(idx)
+    tickers = list(dict.fromkeys(TEMP_WATCHLIST + [t for s in sector_names if s != TEMP_SECTOR for t in SECTORS[s]]))
+    return sector_names, memberships, tickers
+
+def _read_last_run():
+    try:
+        with open(LAST_RUN_FILE, encoding="utf-8") as f:
+            return datetime.fromisoformat(json.load(f)['run_at'])
+    except Exception:
+        return None
+
+def _write_last_run():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(LAST_RUN_FILE, "w", encoding="utf-8") as f:
+        json.dump({"run_at": datetime.now(timezone.utc).isoformat()}, f)
+
+def _set_ci_output(key, value):
+    # GitHub Actions：讓後續步驟知道這次是否略過
+    path = os.environ.get("GITHUB_OUTPUT")
+    if not path: return
+    with open(path, "a", encoding="utf-8") as f: f.write(f"{key}={value}\n")
+
+def run_json():
+    # 純文字 / JSON 模式：與頁面同一條 pipeline，但不產生 HTML，也不載入任何繪圖套件 (RENDER_CHARTS = False)
+    _, memberships, tickers = sector_layout()
+    done, (market_status, market_text, market_bonus) = run_pipeline(memberships, tickers)
+    results = {t: {k: v for k, v in item['payload'].items() if k not in ("img_d", "img_h")} for t, item in done.items()}
+    results = dict(sorted(results.items(), key=lambda kv: kv[1]['score'], reverse=True))
+    return {"updated": datetime.now().strftime('%Y-%m-%d %H:%M UTC'), "market": market_status,
+            "market_text": market_text, "market_bonus": market_bonus, "tickers": results}
+
+def main(argv=None):
+    global RENDER_CHARTS
+    ap = argparse.ArgumentParser(description="DailyDip 分析程式")
+    ap.add_argument("--no-charts", action="store_true", help="產生 HTML 但不畫圖 (不載入 matplotlib / mplfinance)")
+    ap.add_argument("--json", nargs="?", const="-", default=None, metavar="PATH", help="只輸出 JSON 結果 (不產生 HTML、不畫圖)；未指定路徑時輸出到 stdout")
+    ap.add_argument("--force", action="store_true", help="休市期間也強制重新產生頁面")
+    args = ap.parse_args(argv)
+    if args.no_charts or args.json is not None: RENDER_CHARTS = False
+
+    if args.json is not None:
+        # stdout 留給 JSON，進度訊息改印到 stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            report = run_json()
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if args.json == "-": print(text)
+        else:
+            with open(args.json, "w", encoding="utf-8") as f: f.write(text)
+            print(f"✅ {args.json} generated!")
+        return
+
+    print("🚀 啟動分析程式 (Bug已修復，封面顯示爆量)...")
+
+    last_run = _read_last_run()
+    if not args.force and last_run is not None and not market_calendar.has_new_bar(last_run):
+        print(f"💤 休市中：上次執行 ({last_run:%Y-%m-%d %H:%M UTC}) 之後沒有交易時段收盤，略過本次更新")
+        _set_ci_output("skipped", "true")
+        return
+    _set_ci_output("skipped", "false")
+    
+    sector_names, memberships, tickers = sector_layout()
+
+    print(f"🔎 掃描 {len(tickers)} 隻股票 (暫時名單 {len(TEMP_WATCHLIST)} 隻)...")
+    temp_only = {t for t, parts in memberships.items() if parts == [len(sector_names) - 1]} if TEMP_WATCHLIST else set()
+    done, (market_status, market_text, market_bonus) = run_pipeline(memberships, tickers, temp_only)
+    market_color = "#10b981" if market_status == "BULLISH" else ("#ef4444" if market_status == "BEARISH" else "#fbbf24")
+    
+    APP_DATA = {t: item['payload'] for t, item in done.items() if item['payload'] is not None}
+    sector_html_blocks, screener_rows_list = "", []
+
+    # 1. 處理暫時觀察名單 (WAIT 自動移除，只有 LONG 會顯示)
+    valid_temp_stocks = []
+    for t in TEMP_WATCHLIST:
+        if t not in done: continue
+        if done[t]['row']['signal'] == "WAIT":
+            print(f"   🗑️ {t} (WAIT) -> 移除")
+        else:
+            valid_temp_stocks.append(t)
+            screener_rows_list.append(done[t]['row'])
+            print(f"   ✨ {t} (LONG) -> 保留")
+    if valid_temp_stocks:
+        SECTORS[TEMP_SECTOR] = valid_temp_stocks
+    
+    # 2. 組合各板塊
+    partitions = {}
+    for idx, sector in enumerate(sector_names):
+        if sector not in SECTORS: continue
+        sector_results = [done[t]['row'] for t in SECTORS[sector] if t in done]
+        screener_rows_list += [r for r in sector_results if r['signal'] == "LONG"]
+        sector_results.sort(key=lambda x: x['score'], reverse=True)
+        
+        cards = "".join(done[r['ticker']]['cards'][idx] for r in sector_results)
+        if cards:
+            sector_html_blocks += f"<h3 class='sector-title'>{sector}</h3><div class='grid'>{cards}</div>"
+            partitions[idx] = {r['ticker']: APP_DATA[r['ticker']] for r in sector_results}
 
     # 去重
     seen = set()
@@ -420,7 +659,13 @@ def main():
         vol_fire = "🔥" if res['rvol'] > 1.5 else ""
         screener_html += f"<tr><td>{res['ticker']}</td><td>${res['price']:.2f}</td><td class='{score_cls}'><b>{res['score']}</b> {vol_fire}</td><td><span class='badge {res['cls']}'>{res['signal']}</span></td></tr>"
 
-    json_data = json.dumps(APP_DATA)
+    build_id = datetime.now().strftime('%Y%m%d%H%M')
+    if PARTITION_DATA:
+        json_data = "null"
+        part_bytes = write_partitions(partitions)
+        print(f"📦 {len(partitions)} 個板塊資料檔 ({part_bytes/1024:.1f} KB)")
+    else:
+        json_data = json.dumps(APP_DATA, ensure_ascii=False, separators=(',', ':'))
     final_html = f"""
     <!DOCTYPE html>
     <html lang="zh-Hant">
@@ -437,6 +682,7 @@ def main():
     .card {{ background:var(--card); border:1px solid #333; border-radius:8px; padding:12px; cursor:pointer; }}
     .head {{ display:flex; justify-content:space-between; align-items:start; }}
     .code {{ font-weight:900; font-size:1.1rem; }} 
+    .spark {{ display:block; width:100%; height:24px; margin-top:8px; }}
     .badge {{ padding:2px 6px; border-radius:4px; font-size:0.75rem; font-weight:bold; display:inline-block; }}
     .b-long {{ background:rgba(16,185,129,0.2); color:var(--g); border:1px solid var(--g); }}
     .b-wait {{ background:rgba(148,163,184,0.1); color:#94a3b8; border:1px solid #555; }}
@@ -485,21 +731,42 @@ def main():
 
         <script>
         const STOCK_DATA = {json_data};
+        const PARTS = {{}};
+        function loadPart(p) {{
+            if (!(p in PARTS)) PARTS[p] = fetch('{DATA_DIR}/p' + p + '.json?v={build_id}').then(r => r.json());
+            return PARTS[p];
+        }}
         function setTab(id, el) {{
             document.querySelectorAll('.content').forEach(c => c.classList.remove('active'));
             document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
             document.getElementById(id).classList.add('active');
             el.classList.add('active');
         }}
-        function openModal(ticker) {{
-            const data = STOCK_DATA[ticker];
+        function fx(x, n) {{ return x == null ? 'nan' : x.toFixed(n); }}
+        function renderDeploy(d) {{
+            if (d.signal !== 'LONG') {{
+                const reason = (!d.fvg && !d.sweep) ? '無FVG/Sweep' : (!d.bull ? '逆勢' : '溢價區');
+                return "<div class='deploy-box wait'><div class='deploy-title'>⏳ WAIT</div><div>評分: <b style='color:#94a3b8'>" + d.score + "</b></div><ul class='deploy-list'><li>狀態: " + reason + "</li><li>參考入場: $" + fx(d.entry, 2) + "</li></ul></div>";
+            }}
+            const sc = d.score >= 85 ? '#10b981' : (d.score >= 70 ? '#3b82f6' : '#fbbf24');
+            const reasons = d.reasons.map(r => '<li>✅ ' + r + '</li>').join('');
+            const conf = d.strat >= 2 ? '🔥 <b>策略共振：</b> 同時觸發 ' + d.strat + ' 種訊號，可靠度極高。' : '';
+            const levels = (d.liq && d.liq[0].length) ? ' ' + d.liq[0].join('/') + ' 根低點' : '';
+            const sweep = d.sweep ? "<div style='margin-top:8px; padding:8px; background:rgba(251,191,36,0.1); border-left:3px solid #fbbf24; color:#fcd34d; font-size:0.85rem;'><b>⚠️ 偵測到流動性獵殺 (Sweep)</b>" + levels + "</div>" : '';
+            const elite = "<div style='background:rgba(16,185,129,0.1); border:1px solid #10b981; padding:12px; border-radius:8px; margin:10px 0;'><div style='font-weight:bold; color:#10b981; margin-bottom:5px;'>💎 AI 分析 (Score " + d.score + ")</div><div style='font-size:0.85rem; color:#e2e8f0; margin-bottom:8px;'>" + conf + "</div><ul style='margin:0; padding-left:20px; font-size:0.8rem; color:#d1d5db;'>" + reasons + "</ul>" + sweep + "</div>";
+            const perf = (d.perf != null && d.perf >= 0 ? '+' : '') + fx(d.perf, 1);
+            return "<div class='deploy-box long'><div class='deploy-title'>✅ LONG SETUP</div><div style='display:flex;justify-content:space-between;border-bottom:1px solid #333;padding-bottom:5px;margin-bottom:5px;'><span>🏆 評分: <b style='color:" + sc + ";font-size:1.1em'>" + d.score + "</b></span><span>💰 RR: <b style='color:#10b981'>" + fx(d.rr, 1) + "R</b></span></div><div style='font-size:0.8rem; color:#94a3b8; margin-bottom:5px;'>📈 近30日績效: " + perf + "%</div>" + elite + "<ul class='deploy-list' style='margin-top:10px'><li>TP: $" + fx(d.tp, 2) + "</li><li>Entry: $" + fx(d.entry, 2) + "</li><li>SL: $" + fx(d.sl, 2) + "</li></ul></div>";
+        }}
+        async function openModal(ticker, p) {{
+            const part = STOCK_DATA || await loadPart(p);
+            const data = part[ticker];
             if (!data) return;
             const imgD = data.img_d ? '<img src="'+data.img_d+'">' : '<div style="padding:20px;text-align:center;color:#666">No Chart Available</div>';
             const imgH = data.img_h ? '<img src="'+data.img_h+'">' : '';
             
             document.getElementById('modal').style.display = 'flex';
             document.getElementById('m-ticker').innerText = ticker;
-            document.getElementById('m-deploy').innerHTML = data.deploy;
+            document.getElementById('m-deploy').innerHTML = renderDeploy(data);
             document.getElementById('chart-d').innerHTML = imgD;
             document.getElementById('chart-h').innerHTML = imgH;
         }}
@@ -507,9 +774,25 @@ def main():
     </body></html>
     """
     
-    with open("index.html", "w", encoding="utf-8") as f:
-        f.write(final_html)
-    print("✅ index.html generated!")
+    html_bytes = write_output("index.html", final_html)
+    _write_last_run()
+    run_time = datetime.now(timezone.utc)
+    run_results = [item['res'] for item in done.values()]
+    try:
+        conn = history.connect()
+        n = history.record_run(conn, run_time.isoformat(timespec="seconds"), run_results, market_status, market_bonus)
+        conn.close()
+        print(f"🗄️ 已寫入 {n} 筆紀錄到 {history.DB_PATH}")
+    except Exception as e:
+        print(f"⚠️ 歷史紀錄寫入失敗: {e}")
+    try:
+        path = export.export_results(run_results, "analysis", export.ANALYSIS_SCHEMA, run_time)
+        if path: print(f"📤 已匯出 {len(run_results)} 筆分析結果到 {path}")
+    except Exception as e:
+        print(f"⚠️ 匯出失敗: {e}")
+    chart_report()
+    http_cache.report()
+    print(f"✅ index.html generated! ({html_bytes/1024:.1f} KB)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,111 @@
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+# --- 設定 ---
+# NYSE / Nasdaq 常規交易時段 (美東時間)，休市日規則內建於本地，不需要網路
+ET = ZoneInfo("America/New_York")
+OPEN = time(9, 30)
+CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+# 收盤後還要等收盤競價 / 最終成交量入帳，這段時間內抓到的日K不算定案
+SETTLE = timedelta(minutes=30)
+
+# 不在固定規則內的臨時休市 (國喪日等)
+SPECIAL_CLOSURES = {
+    date(2012, 10, 29), date(2012, 10, 30),   # 颶風 Sandy
+    date(2018, 12, 5),                        # 老布希國喪日
+    date(2025, 1, 9),                         # 卡特國喪日
+}
+
+# --- 1. 假日規則 ---
+def _easter(y):
+    # 西曆復活節 (Anonymous Gregorian algorithm)
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(y, month, day + 1)
+
+def _nth_weekday(y, month, weekday, n):
+    # n >= 1：第 n 個星期幾；n = -1：最後一個
+    if n > 0:
+        d = date(y, month, 1)
+        d += timedelta(days=(weekday - d.weekday()) % 7)
+        return d + timedelta(weeks=n - 1)
+    d = date(y, month + 1, 1) - timedelta(days=1) if month < 12 else date(y, 12, 31)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+def _observed(d):
+    # 週六的假日提前到週五，週日的假日順延到週一
+    if d.weekday() == 5: return d - timedelta(days=1)
+    if d.weekday() == 6: return d + timedelta(days=1)
+    return d
+
+@lru_cache(maxsize=None)
+def holidays(y):
+    days = {
+        _nth_weekday(y, 1, 0, 3),          # 馬丁路德金紀念日
+        _nth_weekday(y, 2, 0, 3),          # 總統日
+        _easter(y) - timedelta(days=2),    # 耶穌受難日
+        _nth_weekday(y, 5, 0, -1),         # 陣亡將士紀念日
+        _observed(date(y, 7, 4)),          # 獨立紀念日
+        _nth_weekday(y, 9, 0, 1),          # 勞動節
+        _nth_weekday(y, 11, 3, 4),         # 感恩節
+        _observed(date(y, 12, 25)),        # 聖誕節
+    }
+    # 元旦：落在週六時 NYSE 不會提前到前一年的 12/31 休市
+    if date(y, 1, 1).weekday() != 5: days.add(_observed(date(y, 1, 1)))
+    if y >= 2022: days.add(_observed(date(y, 6, 19)))   # 六月節
+    days |= {d for d in SPECIAL_CLOSURES if d.year == y}
+    return frozenset(days)
+
+@lru_cache(maxsize=None)
+def early_closes(y):
+    days = {
+        _nth_weekday(y, 11, 3, 4) + timedelta(days=1),  # 感恩節翌日
+        date(y, 12, 24),                                # 平安夜
+        date(y, 7, 3),                                  # 獨立紀念日前一天
+    }
+    return frozenset(d for d in days if d.weekday() < 5 and d not in holidays(y))
+
+# --- 2. 交易時段查詢 ---
+def is_session(d):
+    return d.weekday() < 5 and d not in holidays(d.year)
+
+def session_close(d):
+    t = EARLY_CLOSE if d in early_closes(d.year) else CLOSE
+    return datetime.combine(d, t, tzinfo=ET)
+
+def session_open(d):
+    return datetime.combine(d, OPEN, tzinfo=ET)
+
+def _now(now=None):
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None: now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(ET)
+
+def is_open(now=None):
+    now = _now(now)
+    d = now.date()
+    return is_session(d) and session_open(d) <= now < session_close(d)
+
+def last_close(now=None):
+    # 最近一個已經收盤的交易時段的收盤時間
+    now = _now(now)
+    d = now.date()
+    if is_session(d) and now >= session_close(d): return session_close(d)
+    d -= timedelta(days=1)
+    while not is_session(d): d -= timedelta(days=1)
+    return session_close(d)
+
+def has_new_bar(since, now=None):
+    # since 之後是否可能出現新K線：盤中一定有；休市時要 since 晚於最近一次收盤 + SETTLE 才算已拿到定案的K線
+    if since is None: return True
+    if since.tzinfo is None: since = since.replace(tzinfo=timezone.utc)
+    return is_open(now) or since < last_close(now) + SETTLE
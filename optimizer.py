@@ -0,0 +1,214 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+
+import main as dd
+import scoring
+
+# --- 設定 ---
+# 參數掃描範圍 (未列出的參數沿用 main.SCORE_PARAMS)
+GRID = {
+    "rsi_low": [35, 40, 45],
+    "rsi_high": [50, 55, 60],
+    "rvol_high": [1.3, 1.5, 2.0],
+    "rvol_mid": [1.0, 1.1, 1.2],
+    "rr_high": [2.5, 3.0, 4.0],
+    "rr_mid": [1.5, 2.0],
+    "sweep_bonus": [10, 20, 30],
+    "sniper_dist": [0.005, 0.01, 0.02],
+    "smc_window": [30, 50, 80],
+}
+OOS_RATIO = 0.3      # 每隻股票最後 30% 的K線作為樣本外 (out-of-sample)
+WARMUP = 200         # 前 200 根用來暖機 (SMA200)
+HOLD_BARS = 20       # 每筆交易最多持有 20 根
+MIN_SCORE = 75       # 只有評分 >= 75 的 LONG 才進場
+MIN_TRADES = 5       # 樣本外交易數不足者排到最後
+
+# 行程池共享的唯讀價格資料 (fork 時由子行程直接繼承，不會逐個任務複製)
+_DATA = {}
+_SMC_CACHE = {}
+
+# --- 1. 數據載入 ---
+def load_data(tickers, data_dir=None, period="2y"):
+    data = {}
+    for t in tickers:
+        if data_dir:
+            path = os.path.join(data_dir, f"{t}.csv")
+            if not os.path.exists(path): continue
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+        else:
+            time.sleep(0.3)
+            df = dd.fetch_data_safe(t, period, "1d")
+        if df is None or len(df) < WARMUP + 50: continue
+        data[t] = df[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
+    return data
+
+def _init_worker(data):
+    global _DATA
+    if data is not None: _DATA = data
+
+# --- 2. 單一參數組回測 ---
+def _smc_at(t, df, i, window):
+    key = (t, i, window)
+    if key not in _SMC_CACHE:
+        _SMC_CACHE[key] = dd.calculate_smc(df.iloc[:i + 1], {"smc_window": window})
+    return _SMC_CACHE[key]
+
+def _simulate(high, low, close, i, entry, sl, tp):
+    # 掛單於 entry，之後先碰 SL 還是 TP (同根同時碰到視為止損)
+    risk = entry - sl
+    if risk <= 0: return None, i + 1
+    filled = False
+    end = min(i + HOLD_BARS, len(close) - 1)
+    for j in range(i + 1, end + 1):
+        if not filled:
+            if low[j] > entry: continue
+            filled = True
+        if low[j] <= sl: return -1.0, j
+        if high[j] >= tp: return (tp - entry) / risk, j
+    if not filled: return None, end
+    return (close[end] - entry) / risk, end
+
+def _backtest_ticker(t, df, params):
+    close_s = df['Close']
+    rsi, rvol, _, _, _ = dd.calculate_indicators(df)
+    rsi, rvol = rsi.to_numpy(), rvol.to_numpy()
+    sma50 = close_s.rolling(50).mean().to_numpy()
+    sma200 = close_s.rolling(200).mean().to_numpy()
+    high, low, close = df['High'].to_numpy(), df['Low'].to_numpy(), close_s.to_numpy()
+    split = int(len(df) * (1 - OOS_RATIO))
+
+    # 1. 先找出所有出現 LONG 訊號的K線
+    cand = []
+    for i in range(WARMUP, len(df) - 1):
+        bsl, ssl, eq, entry, sl, found_fvg, found_sweep = _smc_at(t, df, i, params['smc_window'])
+        if close[i] > sma200[i] and close[i] < eq and (found_fvg or found_sweep):
+            cand.append((i, entry, sl, bsl, found_sweep))
+    if not cand: return {"is": [], "oos": []}
+
+    # 2. 所有候選K線一次批次評分 (scoring 規則表)
+    idx = np.array([c[0] for c in cand])
+    entry, sl, tp = (np.array([c[k] for c in cand], dtype=float) for k in (1, 2, 3))
+    risk = entry - sl
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cols = {
+            "rr": np.where(risk > 0, (tp - entry) / risk, 0.0),
+            "rsi": rsi[idx], "rvol": rvol[idx],
+            "found_sweep": np.array([c[4] for c in cand], dtype=bool),
+            "golden_cross": (sma50[idx] > sma200[idx]) & (sma50[idx - 4] <= sma200[idx - 4]),
+            "dist_pct": np.abs(close[idx] - entry) / entry,
+            "trend": sma50[idx] > sma200[idx],
+            "market_bonus": 0,
+        }
+    scores = scoring.score_batch(cols, params)[0]
+
+    # 3. 依時間順序模擬交易 (持倉期間的訊號略過)
+    trades = {"is": [], "oos": []}
+    busy_until = 0
+    for k, i in enumerate(idx):
+        if i < busy_until or scores[k] < MIN_SCORE: continue
+        r, exit_i = _simulate(high, low, close, i, entry[k], sl[k], tp[k])
+        if r is not None: trades["is" if i < split else "oos"].append(r)
+        busy_until = exit_i
+    return trades
+
+def _metrics(rs):
+    if not rs: return {"trades": 0, "win_rate": 0.0, "avg_r": 0.0, "total_r": 0.0}
+    arr = np.asarray(rs)
+    return {"trades": len(arr), "win_rate": float((arr > 0).mean()), "avg_r": float(arr.mean()), "total_r": float(arr.sum())}
+
+def evaluate(params):
+    full = dict(dd.SCORE_PARAMS, **params)
+    all_trades = {"is": [], "oos": []}
+    for t, df in _DATA.items():
+        try:
+            res = _backtest_ticker(t, df, full)
+        except Exception as e:
+            print(f"Err {t}: {e}")
+            continue
+        all_trades["is"] += res["is"]
+        all_trades["oos"] += res["oos"]
+    return {"params": params, "is": _metrics(all_trades["is"]), "oos": _metrics(all_trades["oos"])}
+
+# --- 3. 參數組產生 ---
+def grid_sets(grid):
+    keys = list(grid)
+    return [dict(zip(keys, vals)) for vals in itertools.product(*(grid[k] for k in keys))]
+
+def random_sets(grid, n, seed=0):
+    rng = random.Random(seed)
+    seen, out = set(), []
+    total = int(np.prod([len(v) for v in grid.values()]))
+    while len(out) < min(n, total):
+        p = {k: rng.choice(v) for k, v in grid.items()}
+        key = tuple(sorted(p.items()))
+        if key in seen: continue
+        seen.add(key)
+        out.append(p)
+    return out
+
+def _rank_key(r):
+    oos = r["oos"]
+    return (oos["trades"] >= MIN_TRADES, oos["avg_r"], oos["total_r"])
+
+# --- 4. 行程池執行 ---
+def run(param_sets, data, workers=None):
+    global _DATA
+    _DATA = data
+    if "fork" in mp.get_all_start_methods():
+        ctx, initargs = mp.get_context("fork"), (None,)
+    else:
+        # 無 fork 的平台：每個 worker 啟動時收一份，仍然不會每個任務重複傳送
+        ctx, initargs = mp.get_context("spawn"), (data,)
+    with ctx.Pool(workers or os.cpu_count(), initializer=_init_worker, initargs=initargs) as pool:
+        results = pool.map(evaluate, param_sets, chunksize=1)
+    results.sort(key=_rank_key, reverse=True)
+    return results
+
+def main():
+    ap = argparse.ArgumentParser(description="評分權重 / SMC 門檻參數掃描")
+    ap.add_argument("--mode", choices=["grid", "random"], default="random")
+    ap.add_argument("-n", type=int, default=50, help="random 模式的參數組數量")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--data", default=None, help="離線資料夾 (每隻股票一個 <TICKER>.csv)")
+    ap.add_argument("--tickers", default=None, help="逗號分隔，預設為 main.SECTORS 全部")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--out", default="optimizer_results.json")
+    args = ap.parse_args()
+
+    if args.tickers: tickers = args.tickers.split(",")
+    else: tickers = list(dict.fromkeys(t for ts in dd.SECTORS.values() for t in ts))
+
+    print(f"📦 載入 {len(tickers)} 隻股票數據...")
+    data = load_data(tickers, args.data)
+    if not data:
+        print("❌ 沒有可用數據")
+        sys.exit(1)
+
+    param_sets = grid_sets(GRID) if args.mode == "grid" else random_sets(GRID, args.n)
+    print(f"🚀 評估 {len(param_sets)} 組參數 ({len(data)} 隻股票)...")
+    t0 = time.time()
+    results = run(param_sets, data, args.workers)
+    print(f"⏱️ 完成，用時 {time.time() - t0:.1f}s")
+
+    print("-" * 70)
+    print(f"{'#':<4} {'OOS N':<7} {'OOS Win':<10}{'OOS R':<8} {'IS N':<6} {'IS R':<8}")
+    print("-" * 70)
+    for rank, r in enumerate(results[:args.top], 1):
+        o, i = r["oos"], r["is"]
+        print(f"{rank:<4} {o['trades']:<7} {o['win_rate']*100:>6.1f}%   {o['avg_r']:<+8.2f} {i['trades']:<6} {i['avg_r']:<+8.2f}")
+        print(f"     {json.dumps(r['params'])}")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"✅ {args.out} generated!")
+
+if __name__ == "__main__":
+    main()
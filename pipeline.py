@@ -0,0 +1,115 @@
+import time
+import queue
+import threading
+
+# 佇列結束標記
+_DONE = object()
+
+# --- 1. 階段定義 ---
+class Stage:
+    # fn(item, **deps) -> 新的 item；回傳 None 代表丟棄 (例如數據不足)
+    def __init__(self, name, fn, workers=1, maxsize=8, requires=()):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.maxsize = maxsize
+        self.requires = tuple(requires)
+        self.done = 0          # 處理完成的數量
+        self.dropped = 0       # 回傳 None 或出錯而丟棄的數量
+        self.busy = 0.0        # 所有 worker 累計的執行秒數
+
+class Dependency:
+    # 只需要算一次、多個階段共用的前置結果 (例如大盤狀態)，與第一個階段同時開始計算
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self._ready = threading.Event()
+        self._value = None
+        self._error = None
+
+    def _run(self):
+        try:
+            self._value = self.fn()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._ready.set()
+
+    def get(self):
+        self._ready.wait()
+        if self._error is not None: raise self._error
+        return self._value
+
+# --- 2. 執行器 ---
+class Pipeline:
+    def __init__(self, stages, deps=()):
+        self.stages = list(stages)
+        self.deps = {d.name: d for d in deps}
+        for s in self.stages:
+            missing = [r for r in s.requires if r not in self.deps]
+            if missing: raise ValueError(f"stage {s.name} requires unknown dependency: {missing}")
+
+    def dep(self, name):
+        return self.deps[name].get()
+
+    def _worker(self, idx, inbox, outbox, state):
+        stage = self.stages[idx]
+        while True:
+            msg = inbox.get()
+            if msg is _DONE:
+                with state['lock']:
+                    state['left'] -= 1
+                    last = state['left'] == 0
+                # 最後一個結束的 worker 通知下游所有 worker
+                if last:
+                    n = self.stages[idx + 1].workers if idx + 1 < len(self.stages) else 1
+                    for _ in range(n): outbox.put(_DONE)
+                return
+            i, item = msg
+            t0 = time.perf_counter()
+            try:
+                kwargs = {r: self.dep(r) for r in stage.requires}
+                out = stage.fn(item, **kwargs)
+            except Exception as e:
+                print(f"Err [{stage.name}] {item.get('ticker') if isinstance(item, dict) else item}: {e}")
+                out = None
+            stage.busy += time.perf_counter() - t0
+            if out is None:
+                stage.dropped += 1
+                continue
+            stage.done += 1
+            outbox.put((i, out))
+
+    def run(self, items):
+        # 回傳與輸入順序一致的結果 list (被丟棄的項目不會出現)
+        for d in self.deps.values():
+            threading.Thread(target=d._run, name=f"dep-{d.name}", daemon=True).start()
+
+        # 各階段之間用有上限的佇列串接，上游太快時會被擋住，不會把記憶體塞爆
+        queues = [queue.Queue(maxsize=s.maxsize) for s in self.stages] + [queue.Queue()]
+        threads = []
+        for idx, stage in enumerate(self.stages):
+            state = {"lock": threading.Lock(), "left": stage.workers}
+            for w in range(stage.workers):
+                th = threading.Thread(target=self._worker, args=(idx, queues[idx], queues[idx + 1], state), name=f"{stage.name}-{w}", daemon=True)
+                th.start()
+                threads.append(th)
+
+        def feed():
+            for i, item in enumerate(items): queues[0].put((i, item))
+            for _ in range(self.stages[0].workers): queues[0].put(_DONE)
+        threading.Thread(target=feed, name="feeder", daemon=True).start()
+
+        results = {}
+        while True:
+            msg = queues[-1].get()
+            if msg is _DONE: break
+            results[msg[0]] = msg[1]
+        for th in threads: th.join()
+        return [results[i] for i in sorted(results)]
+
+    def report(self, elapsed):
+        # 每個階段的平均忙碌時間 ≈ 該階段的瓶頸程度；總時間應接近最慢的那個階段
+        print(f"⏱️ Pipeline 完成，用時 {elapsed:.1f}s")
+        for s in self.stages:
+            print(f"   {s.name:<10} workers={s.workers:<2} done={s.done:<4} dropped={s.dropped:<3} busy={s.busy:.1f}s (~{s.busy / s.workers:.1f}s/worker)")
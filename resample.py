@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+import market_calendar
+
+# --- 設定 ---
+ET = "America/New_York"
+TIMEFRAMES = ("1h", "4h", "1d", "1w")
+AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+# --- 1. 交易時段邊界 ---
+def _to_et(df):
+    idx = df.index
+    if not isinstance(idx, pd.DatetimeIndex): idx = pd.to_datetime(idx)
+    idx = idx.tz_localize(ET) if idx.tz is None else idx.tz_convert(ET)
+    out = df.copy()
+    out.index = idx
+    return out
+
+def _session_bounds(days):
+    # 每個交易日的開盤 / 收盤時間 (只對不重複的日期算一次，半日市也正確)
+    uniq = pd.DatetimeIndex(days.unique())
+    pos = uniq.get_indexer(days)
+    is_session = np.array([market_calendar.is_session(d.date()) for d in uniq], dtype=bool)
+    opens = pd.DatetimeIndex([market_calendar.session_open(d.date()) for d in uniq]).tz_convert(ET)
+    closes = pd.DatetimeIndex([market_calendar.session_close(d.date()) for d in uniq]).tz_convert(ET)
+    return is_session[pos], opens[pos], closes[pos]
+
+def regular_hours(df):
+    # 只保留常規交易時段的K線 (去掉盤前盤後與休市日)
+    df = _to_et(df)
+    is_session, opens, closes = _session_bounds(df.index.normalize())
+    return df[is_session & (df.index >= opens) & (df.index < closes)]
+
+# --- 2. 重新取樣 ---
+def _aggregate(df, keys, labels):
+    grouped = df[list(AGG)].groupby(keys, sort=True)
+    out = grouped.agg(AGG)
+    out.index = pd.DatetimeIndex(labels.groupby(keys, sort=True).first())
+    return out
+
+def resample_ohlcv(df, rule):
+    # rule: "<n>h" (以開盤 09:30 為錨點切段)、"1d" (每個交易日)、"1w" (每週，以該週第一個交易日標記)
+    df = regular_hours(df)
+    if df.empty: return df
+    days = df.index.normalize()
+    if rule == "1d":
+        keys = days.asi8
+        labels = pd.Series(days, index=df.index)
+    elif rule == "1w":
+        monday = days - pd.to_timedelta(days.weekday, unit="D")
+        keys = monday.asi8
+        labels = pd.Series(days, index=df.index)
+    elif rule.endswith("h"):
+        n = int(rule[:-1])
+        _, opens, _ = _session_bounds(days)
+        bucket = ((df.index - opens) // pd.Timedelta(hours=n)).astype(np.int64)
+        starts = opens + pd.to_timedelta(bucket * n, unit="h")
+        keys = starts.asi8
+        labels = pd.Series(starts, index=df.index)
+    else:
+        raise ValueError(f"unsupported rule: {rule}")
+    keys = pd.Series(keys, index=df.index)
+    return _aggregate(df, keys, labels)
+
+def build_timeframes(base, timeframes=TIMEFRAMES):
+    # base 為最細的週期 (例如 1h)，其餘週期全部在本地推導，不必再下載
+    return {tf: resample_ohlcv(base, tf) for tf in timeframes}
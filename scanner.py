@@ -1,13 +1,24 @@
-import pandas as pd
+import numpy as np
 import yfinance as yf
 import time
 import os
+import argparse
+from datetime import datetime, timezone
+
+from screen_expr import compile_screen, ScreenError
+import export
+import universe
 
 # --- 設定 ---
-CSV_FILE = "nasdaq_mid_large_caps (2).csv"
+CSV_FILE = universe.CSV_FILE
 MIN_VOLUME_MULTIPLIER = 1.5  # 只顯示量大於 1.5x 的
 MIN_SCORE = 70               # 只顯示分數及格的
 
+# 篩選條件 (可用 --screen / --hot 覆寫)，欄位見 SCREEN_COLUMNS
+SCREEN = f"rvol >= {MIN_VOLUME_MULTIPLIER} and close > sma50 and score >= {MIN_SCORE}"
+HOT = "change_pct > 5 or rvol > 2"   # 亮點顯示 🔥
+SCREEN_COLUMNS = ("close", "change_pct", "rvol", "sma50", "score", "bull", "volume")
+
 def fetch_data_quick(ticker):
     try:
         # 只抓 50 天數據，速度最快
@@ -41,44 +52,84 @@ def analyze_stock(ticker, df):
         "Change%": change_pct,
         "RVOL": rvol,
         "Trend": "Bull" if is_bullish else "Bear",
-        "Score": score
+        "Score": score,
+        "SMA50": sma50.iloc[-1],
+        "Volume": vol.iloc[-1]
+    }
+
+def to_columns(results):
+    # 整個股票池的結果轉成欄位陣列，篩選條件一次對全部股票運算
+    return {
+        "close": np.array([r['Price'] for r in results], dtype=float),
+        "change_pct": np.array([r['Change%'] for r in results], dtype=float),
+        "rvol": np.array([r['RVOL'] for r in results], dtype=float),
+        "sma50": np.array([r['SMA50'] for r in results], dtype=float),
+        "score": np.array([r['Score'] for r in results], dtype=float),
+        "bull": np.array([r['Trend'] == "Bull" for r in results], dtype=bool),
+        "volume": np.array([r['Volume'] for r in results], dtype=float),
     }
 
 def main():
-    print(f"🚀 啟動全市場掃描器 (Target: RVOL > {MIN_VOLUME_MULTIPLIER}x)...")
+    ap = argparse.ArgumentParser(description="全市場爆量掃描器")
+    ap.add_argument("--screen", default=SCREEN, help=f"篩選條件 (欄位: {', '.join(SCREEN_COLUMNS)})")
+    ap.add_argument("--hot", default=HOT, help="🔥 亮點條件")
+    universe.add_arguments(ap)   # --cap / --min-price / --max-price / --industry / --keep-dups
+    args = ap.parse_args()
+
+    try:
+        screen = compile_screen(args.screen, SCREEN_COLUMNS)
+        hot = compile_screen(args.hot, SCREEN_COLUMNS)
+    except ScreenError as e:
+        print(f"❌ 篩選條件錯誤: {e}")
+        return
+
+    print(f"🚀 啟動全市場掃描器 (Screen: {args.screen})...")
     
     if not os.path.exists(CSV_FILE):
         print(f"❌ 找不到 {CSV_FILE}")
         return
 
-    df = pd.read_csv(CSV_FILE)
-    tickers = df['Stock Ticker'].dropna().astype(str).tolist()
+    # 股票池只在 CSV 變動時重新編譯；抓數據前先用市值 / 股價 / 產業篩掉，並合併同公司的不同股別
+    u = universe.load(CSV_FILE)
+    tickers = universe.select_args(u, args)
     
-    print(f"📦 總共載入 {len(tickers)} 隻股票。開始掃描...")
-    print("-" * 60)
-    print(f"{'Ticker':<8} {'Price':<10} {'Change%':<10} {'RVOL':<10} {'Trend':<8}")
-    print("-" * 60)
+    print(f"📦 股票池 {len(u)} 隻，篩選後 {len(tickers)} 隻。開始掃描...")
     
-    found_count = 0
+    results = []
     for i, t in enumerate(tickers):
-        # 進度顯示 (每 10 隻更新一次)
+        # 進度顯示 (每 100 隻更新一次)
         if i % 100 == 0: print(f"🔍 Scanning... [{i}/{len(tickers)}]")
             
         df_stock = fetch_data_quick(t)
         if df_stock is None: continue
         
-        res = analyze_stock(t, df_stock)
-        
-        # 🔥 篩選條件：爆量 且 趨勢向上
-        if res['RVOL'] >= MIN_VOLUME_MULTIPLIER and res['Trend'] == "Bull":
-            # 亮點顯示：如果漲幅 > 5% 或 RVOL > 2.0，加強顯示
-            marker = "🔥" if (res['Change%'] > 5 or res['RVOL'] > 2.0) else ""
-            
-            print(f"{res['Ticker']:<8} ${res['Price']:<9.2f} {res['Change%']:+.2f}%   {res['RVOL']:.1f}x      {res['Trend']} {marker}")
-            found_count += 1
+        results.append(analyze_stock(t, df_stock))
+
+    # 🔥 篩選條件：一次對整個股票池算出遮罩
+    cols = to_columns(results)
+    mask = screen.mask(cols, len(results))
+    hot_mask = hot.mask(cols, len(results))
+
+    print("-" * 60)
+    print(f"{'Ticker':<8} {'Price':<10} {'Change%':<10} {'RVOL':<10} {'Trend':<8}")
+    print("-" * 60)
+    for idx in np.flatnonzero(mask):
+        res = results[idx]
+        # 亮點顯示：符合 HOT 條件 (預設漲幅 > 5% 或 RVOL > 2.0) 加強顯示
+        marker = "🔥" if hot_mask[idx] else ""
+        print(f"{res['Ticker']:<8} ${res['Price']:<9.2f} {res['Change%']:+.2f}%   {res['RVOL']:.1f}x      {res['Trend']} {marker}")
             
     print("-" * 60)
-    print(f"✅ 掃描完成！共發現 {found_count} 隻爆量潛力股。")
+    print(f"✅ 掃描完成！共發現 {int(mask.sum())} 隻爆量潛力股。")
+
+    # 📤 整個股票池的結果 (含是否通過篩選) 匯出成欄位檔
+    rows = [{"ticker": r['Ticker'], "price": r['Price'], "change_pct": r['Change%'], "rvol": r['RVOL'], "trend": r['Trend'],
+             "score": r['Score'], "sma50": r['SMA50'], "volume": r['Volume'], "passed": mask[i], "hot": hot_mask[i]} for i, r in enumerate(results)]
+    try:
+        path = export.export_results(rows, "scanner", export.SCANNER_SCHEMA, datetime.now(timezone.utc))
+        if path: print(f"📤 已匯出 {len(rows)} 筆掃描結果到 {path}")
+    except Exception as e:
+        print(f"⚠️ 匯出失敗: {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,53 @@
+import numpy as np
+
+# 評分規則表：(代號, 條件, 分數, 理由)
+# 條件 cond(cols, p) 對整批股票的欄位陣列回傳布林遮罩；分數可以是常數或 points(p)
+# 理由 reason(v) 只在要顯示的股票上才會組出字串 (v 為該股票的欄位值)
+# 同一組 if / elif 的規則，後面那條要排除前面已成立的情況
+
+def _rr_high(c, p): return c['rr'] >= p['rr_high']
+def _rsi_band(c, p): return (c['rsi'] >= p['rsi_low']) & (c['rsi'] <= p['rsi_high'])
+def _rvol_high(c, p): return c['rvol'] > p['rvol_high']
+
+RULES = (
+    ("rr_high", _rr_high, 15, lambda v: f"💰 盈虧比極佳 ({v['rr']:.1f}R)"),
+    ("rr_mid", lambda c, p: (c['rr'] >= p['rr_mid']) & ~_rr_high(c, p), 10, lambda v: f"💰 盈虧比優秀 ({v['rr']:.1f}R)"),
+    ("rsi_band", _rsi_band, 10, lambda v: f"📉 RSI 完美回調 ({int(v['rsi'])})"),
+    ("rsi_hot", lambda c, p: (c['rsi'] > p['rsi_overbought']) & ~_rsi_band(c, p), -15, None),
+    ("rvol_high", _rvol_high, 10, lambda v: f"🔥 爆量確認 (Vol {v['rvol']:.1f}x)"),
+    ("rvol_mid", lambda c, p: (c['rvol'] > p['rvol_mid']) & ~_rvol_high(c, p), 5, None),
+    ("sweep", lambda c, p: c['found_sweep'], lambda p: p['sweep_bonus'], lambda v: "💧 觸發流動性獵殺 (Sweep)"),
+    ("golden_cross", lambda c, p: c['golden_cross'], 10, lambda v: "✨ 出現黃金交叉"),
+    ("sniper", lambda c, p: c['dist_pct'] < p['sniper_dist'], 15, lambda v: "🎯 狙擊入場區"),
+    ("trend", lambda c, p: c['trend'], 5, lambda v: "📈 長期趨勢向上"),
+    ("market_up", lambda c, p: c['market_bonus'] > 0, 0, lambda v: "🌍 大盤順風車 (+5)"),
+    ("market_down", lambda c, p: c['market_bonus'] < 0, 0, lambda v: "🌪️ 逆大盤風險 (-10)"),
+)
+BASE_SCORE = 60
+COLUMNS = ("rr", "rsi", "rvol", "found_sweep", "golden_cross", "dist_pct", "trend", "market_bonus")
+
+def _column(cols, name, n):
+    arr = np.asarray(cols[name])
+    if arr.ndim == 0: arr = np.full(n, arr)
+    return arr.astype(bool) if name in ("found_sweep", "golden_cross", "trend") else arr.astype(float)
+
+def score_batch(cols, params):
+    # cols: 欄位名稱 -> 長度 n 的陣列 (或純量)；回傳 (分數 int 陣列, 規則位元組 uint32 陣列, 策略共振數)
+    n = max(np.size(cols[c]) for c in COLUMNS)
+    c = {name: _column(cols, name, n) for name in COLUMNS}
+    score = BASE_SCORE + c['market_bonus']
+    bits = np.zeros(n, dtype=np.uint32)
+    with np.errstate(invalid="ignore"):
+        for i, (_, cond, points, _) in enumerate(RULES):
+            hit = np.asarray(cond(c, params), dtype=bool)
+            pts = points(params) if callable(points) else points
+            if pts: score = score + np.where(hit, pts, 0)
+            bits |= hit.astype(np.uint32) << np.uint32(i)
+        strategies = c['found_sweep'].astype(int) + c['golden_cross'].astype(int) + _rsi_band(c, params).astype(int)
+    scores = np.clip(np.trunc(score), 0, 99).astype(int)
+    return scores, bits, strategies
+
+def decode_reasons(bits, values):
+    # bits: 單一股票的規則位元組；values: 該股票的欄位值 (組理由字串用)
+    bits = int(bits)
+    return [reason(values) for i, (_, _, _, reason) in enumerate(RULES) if reason is not None and bits >> i & 1]
@@ -0,0 +1,184 @@
+import re
+import operator
+import numpy as np
+
+# 篩選條件語法，例如：rvol > 1.5 and close > sma50 and change_pct > 3
+# 字串只解析一次，編譯成對整個股票池的欄位陣列 (numpy) 一次算出布林遮罩，不逐行跑 Python
+#
+#   expr := or
+#   or   := and ("or" and)*
+#   and  := not ("and" not)*
+#   not  := "not" not | cmp
+#   cmp  := sum (("<" | "<=" | ">" | ">=" | "==" | "!=") sum)?
+#   sum  := term (("+" | "-") term)*
+#   term := unary (("*" | "/") unary)*
+#   unary:= "-" unary | atom
+#   atom := NUMBER | NAME | "true" | "false" | "(" expr ")"
+# 欄位全部是數值 / 布林，所以不支援字串常數 (引號會在斷詞時就報錯，不會等到掃描完才失敗)
+
+class ScreenError(ValueError):
+    pass
+
+TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+)|([A-Za-z_][A-Za-z0-9_]*)|(<=|>=|==|!=|[<>()+\-*/]))")
+KEYWORDS = {"and", "or", "not", "true", "false"}
+COMPARE = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+ARITH = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": np.divide}
+
+# --- 1. 斷詞 ---
+def tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = TOKEN_RE.match(text, pos)
+        if not m:
+            pos += len(text[pos:]) - len(text[pos:].lstrip())
+            raise ScreenError(f"無法解析的字元 (位置 {pos}): {text[pos:pos + 10]!r}")
+        num, name, op = m.groups()
+        if num is not None: tokens.append(("num", float(num)))
+        elif name is not None:
+            low = name.lower()
+            tokens.append(("kw", low) if low in KEYWORDS else ("name", name))
+        else: tokens.append(("op", op))
+        pos = m.end()
+    return tokens
+
+# --- 2. 解析 (遞迴下降) → 巢狀 tuple 語法樹 ---
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        tok = self.peek()
+        if tok[0] is None or (kind and tok[0] != kind) or (value and tok[1] != value):
+            want = value or kind or "token"
+            raise ScreenError(f"預期 {want}，但得到 {tok[1]!r}")
+        self.i += 1
+        return tok
+
+    def parse(self):
+        node = self.or_()
+        if self.i != len(self.tokens): raise ScreenError(f"多餘的內容: {self.peek()[1]!r}")
+        return node
+
+    def or_(self):
+        node = self.and_()
+        while self.peek() == ("kw", "or"):
+            self.take()
+            node = ("or", node, self.and_())
+        return node
+
+    def and_(self):
+        node = self.not_()
+        while self.peek() == ("kw", "and"):
+            self.take()
+            node = ("and", node, self.not_())
+        return node
+
+    def not_(self):
+        if self.peek() == ("kw", "not"):
+            self.take()
+            return ("not", self.not_())
+        return self.cmp()
+
+    def cmp(self):
+        node = self.sum()
+        tok = self.peek()
+        if tok[0] == "op" and tok[1] in COMPARE:
+            self.take()
+            node = ("cmp", tok[1], node, self.sum())
+        return node
+
+    def sum(self):
+        node = self.term()
+        while self.peek()[0] == "op" and self.peek()[1] in "+-":
+            op = self.take()[1]
+            node = ("arith", op, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek()[0] == "op" and self.peek()[1] in "*/":
+            op = self.take()[1]
+            node = ("arith", op, node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek() == ("op", "-"):
+            self.take()
+            return ("neg", self.unary())
+        return self.atom()
+
+    def atom(self):
+        kind, value = self.peek()
+        if kind == "op" and value == "(":
+            self.take()
+            node = self.or_()
+            self.take("op", ")")
+            return node
+        if kind == "num":
+            self.take()
+            return ("const", value)
+        if kind == "kw" and value in ("true", "false"):
+            self.take()
+            return ("const", value == "true")
+        if kind == "name":
+            self.take()
+            return ("col", value)
+        raise ScreenError(f"預期數值或欄位，但得到 {value!r}")
+
+def parse(text):
+    return _Parser(tokenize(text)).parse()
+
+# --- 3. 編譯成陣列運算 ---
+def _names(node):
+    if node[0] == "col": return {node[1]}
+    return set().union(*(_names(n) for n in node[1:] if isinstance(n, tuple)))
+
+def _build(node):
+    kind = node[0]
+    if kind == "const":
+        v = node[1]
+        return lambda cols: v
+    if kind == "col":
+        name = node[1]
+        return lambda cols: cols[name]
+    if kind == "neg":
+        f = _build(node[1])
+        return lambda cols: -f(cols)
+    if kind == "not":
+        f = _build(node[1])
+        return lambda cols: ~np.asarray(f(cols), dtype=bool)
+    if kind in ("and", "or"):
+        a, b = _build(node[1]), _build(node[2])
+        op = np.logical_and if kind == "and" else np.logical_or
+        return lambda cols: op(a(cols), b(cols))
+    fn = COMPARE[node[1]] if kind == "cmp" else ARITH[node[1]]
+    a, b = _build(node[2]), _build(node[3])
+    return lambda cols: fn(a(cols), b(cols))
+
+class Screen:
+    def __init__(self, text, names=None):
+        self.text = text
+        self.tree = parse(text)
+        self.columns = _names(self.tree)
+        if names is not None:
+            unknown = self.columns - set(names)
+            if unknown: raise ScreenError(f"未知欄位: {', '.join(sorted(unknown))} (可用: {', '.join(sorted(names))})")
+        self._fn = _build(self.tree)
+
+    def mask(self, cols, n=None):
+        # cols: 欄位名稱 -> 等長的 numpy 陣列；回傳長度 n 的布林遮罩
+        if n is None: n = len(next(iter(cols.values()))) if cols else 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = self._fn(cols)
+        return np.broadcast_to(np.asarray(out, dtype=bool), (n,))
+
+    def __repr__(self):
+        return f"Screen({self.text!r})"
+
+def compile_screen(text, names=None):
+    return Screen(text, names)
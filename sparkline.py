@@ -0,0 +1,25 @@
+import numpy as np
+
+# --- 設定 ---
+SPARK_BARS = 30
+SPARK_W, SPARK_H = 100, 24
+UP_COLOR, DOWN_COLOR = "#10b981", "#ef4444"
+
+def sparkline_path(closes, n=SPARK_BARS, width=SPARK_W, height=SPARK_H):
+    # 最近 n 根收盤價 → SVG path (不經過 matplotlib)
+    y = np.asarray(closes, dtype=float)[-n:]
+    y = y[np.isfinite(y)]
+    if len(y) < 2: return ""
+    lo, hi = y.min(), y.max()
+    span = (hi - lo) or 1.0
+    xs = np.linspace(0, width, len(y))
+    ys = (height - 1) - (y - lo) / span * (height - 2)   # 上下各留 1px 避免線條被裁掉
+    pts = np.column_stack((xs, ys)).round(1).ravel().tolist()
+    return "M" + " ".join(map(str, pts))
+
+def sparkline_svg(closes, n=SPARK_BARS, width=SPARK_W, height=SPARK_H):
+    y = np.asarray(closes, dtype=float)[-n:]
+    path = sparkline_path(y, n, width, height)
+    if not path: return ""
+    color = UP_COLOR if y[-1] >= y[0] else DOWN_COLOR
+    return f"<svg class='spark' viewBox='0 0 {width} {height}' preserveAspectRatio='none'><path d='{path}' fill='none' stroke='{color}' stroke-width='1.5'/></svg>"
@@ -0,0 +1,153 @@
+import sys
+import json
+import time
+import socket
+import argparse
+import pandas as pd
+
+import main as dd
+from fvg_index import FVGIndex
+
+# --- 設定 ---
+MAX_BARS = 260   # 每隻股票只保留最近 260 根日K (足夠 SMA200 + SMC 視窗)
+
+# --- 1. 行情來源 ---
+# 每行一根K線 (JSON)：{"ticker": "NVDA", "time": "2026-10-16T14:30:00Z", "open": .., "high": .., "low": .., "close": .., "volume": ..}
+def iter_file(path, speed=0):
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        prev = None
+        for line in f:
+            line = line.strip()
+            if not line: continue
+            bar = json.loads(line)
+            # speed > 0 時按照K線時間間隔回放 (speed=60 代表 60 倍速)
+            if speed > 0:
+                ts = pd.Timestamp(bar['time'])
+                if prev is not None: time.sleep(max((ts - prev).total_seconds() / speed, 0))
+                prev = ts
+            yield bar
+    finally:
+        if f is not sys.stdin: f.close()
+
+def iter_socket(host, port):
+    with socket.create_connection((host, port)) as sock:
+        buf = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk: break
+            buf += chunk
+            while b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                if line.strip(): yield json.loads(line)
+
+def open_feed(src, speed=0):
+    if src.startswith("tcp://"):
+        host, port = src[6:].rsplit(":", 1)
+        return iter_socket(host, int(port))
+    return iter_file(src, speed)
+
+# --- 2. 串流狀態 ---
+class StreamState:
+    def __init__(self, market_bonus=0):
+        self.market_bonus = market_bonus
+        _, self.memberships, _ = dd.sector_layout()   # 卡片要知道去哪個 data/p<N>.json 載入詳情
+        self.frames = {}     # ticker -> 日K DataFrame (最後一根為當日進行中的K線)
+        self.fvg = {}        # ticker -> FVGIndex，隨K線增量更新，不因 MAX_BARS 截斷而重建
+        self.emitted = {}    # ticker -> 上次輸出的 (card, data)，沒變就不重複輸出
+
+    def seed(self, t, df):
+        if df is None or df.empty: return
+        df = df[['Open', 'High', 'Low', 'Close', 'Volume']].tail(MAX_BARS).copy()
+        if df.index.tz is None: df.index = df.index.tz_localize("America/New_York")
+        self.frames[t] = df
+        self.fvg[t] = FVGIndex.from_df(df)
+
+    def _apply_bar(self, t, bar):
+        ts = pd.Timestamp(bar['time'])
+        if ts.tzinfo is None: ts = ts.tz_localize("UTC")
+        df = self.frames.get(t)
+        tz = df.index.tz if df is not None and df.index.tz is not None else "America/New_York"
+        day = ts.tz_convert(tz).normalize()
+        o, h, l, c, v = (float(bar[k]) for k in ("open", "high", "low", "close", "volume"))
+
+        if df is not None and len(df) and df.index[-1].tz_convert(tz).normalize() == day:
+            # 同一交易日：只更新最後一根 (高/低/收/量)
+            last = df.iloc[-1]
+            df.iloc[-1] = [last['Open'], max(last['High'], h), min(last['Low'], l), c, last['Volume'] + v]
+            self.fvg[t].revise_last(df['High'].iloc[-1], df['Low'].iloc[-1])
+        else:
+            row = pd.DataFrame({"Open": [o], "High": [h], "Low": [l], "Close": [c], "Volume": [v]}, index=[day])
+            df = row if df is None else pd.concat([df, row]).tail(MAX_BARS)
+            self.frames[t] = df
+            self.fvg.setdefault(t, FVGIndex()).update(h, l)
+        return df
+
+    def update(self, bar):
+        t = bar['ticker']
+        df = self._apply_bar(t, bar)
+        if len(df) < 50: return None
+
+        res = dd.score_results([dd.analyze_ticker(t, df, self.market_bonus, self.fvg[t])])[0]
+        # 與頁面 data/p<N>.json 相同的結構化資料 (前端 renderDeploy() 組出詳情)，串流不畫圖
+        data = dd.build_payload(res, "", "")
+        part = self.memberships.get(t, [None])[0] if dd.PARTITION_DATA else None
+        card = dd.build_card_html(t, data, part, res['spark'])
+
+        prev = self.emitted.get(t)
+        out = {}
+        if prev is None or prev[0] != card: out["card"] = card
+        if prev is None or prev[1] != data: out["data"] = data
+        if not out: return None
+        self.emitted[t] = (card, data)
+        out["ticker"] = t
+        if part is not None: out["part"] = part
+        return out
+
+# --- 3. 主程式 ---
+def main():
+    ap = argparse.ArgumentParser(description="盤中串流模式：逐根K線更新訊號，只輸出有變動的卡片 / 詳情資料")
+    ap.add_argument("feed", help="行情來源：JSONL 檔案、'-' (stdin) 或 tcp://host:port")
+    ap.add_argument("--speed", type=float, default=0, help="檔案回放倍速 (0 = 不等待)")
+    ap.add_argument("--tickers", default=None, help="逗號分隔，預先載入歷史日K (預設為 main.SECTORS 全部)")
+    ap.add_argument("--no-seed", action="store_true", help="不預先下載歷史日K (只用行情來源的K線)")
+    ap.add_argument("--market-bonus", type=int, default=None, help="略過大盤檢查，直接指定加減分")
+    ap.add_argument("--out", default="-", help="輸出 JSONL 路徑 ('-' = stdout)")
+    args = ap.parse_args()
+
+    if args.market_bonus is None:
+        _, market_text, market_bonus = dd.get_market_condition()
+        print(f"🌍 {market_text}", file=sys.stderr)
+    else:
+        market_bonus = args.market_bonus
+    state = StreamState(market_bonus)
+
+    if not args.no_seed:
+        if args.tickers: tickers = args.tickers.split(",")
+        else: tickers = list(dict.fromkeys(t for ts in dd.SECTORS.values() for t in ts))
+        print(f"📦 載入 {len(tickers)} 隻股票歷史日K...", file=sys.stderr)
+        for t in tickers:
+            state.seed(t, dd.fetch_data_safe(t, "1y", "1d"))
+
+    out = sys.stdout if args.out == "-" else open(args.out, "a", encoding="utf-8")
+    print("📡 開始接收行情...", file=sys.stderr)
+    try:
+        for bar in open_feed(args.feed, args.speed):
+            t0 = time.perf_counter()
+            try:
+                msg = state.update(bar)
+            except Exception as e:
+                print(f"Err {bar.get('ticker')}: {e}", file=sys.stderr)
+                continue
+            if msg is None: continue
+            msg["bar_time"] = bar['time']
+            msg["latency_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            out.write(json.dumps(msg, ensure_ascii=False) + "\n")
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout: out.close()
+
+if __name__ == "__main__":
+    main()
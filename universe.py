@@ -0,0 +1,184 @@
+import os
+import sys
+import pickle
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+
+# 股票池登錄表：NASDAQ CSV 只在檔案變動時 (依內容 hash) 解析一次，編譯成欄位陣列存進 .cache
+# 之後每次掃描都直接讀編譯結果，在抓任何數據之前先用市值 / 股價 / 產業把股票池縮小
+
+# --- 設定 ---
+CSV_FILE = "nasdaq_mid_large_caps (2).csv"
+CACHE_FILE = os.path.join(".cache", "universe.pkl")
+FORMAT_VERSION = 2
+
+# 市值區間 (美元)：[下限, 上限)
+CAP_BANDS = {
+    "mega": (200e9, np.inf),
+    "large": (10e9, 200e9),
+    "mid": (2e9, 10e9),
+    "small": (0, 2e9),
+}
+
+# 同公司不同股別 (GOOG/GOOGL、LBRDA/LBRDK)：代號只差最後一個股別字母，且股價、市值都很接近
+CLASS_LETTERS = set("ABCKL")
+DUP_PRICE_TOL = 0.15
+DUP_CAP_TOL = 0.15
+# 合併時保留哪一檔：依股別字母的優先順序 ("" = 沒有股別字母的那檔)
+# K / A / C 通常是流通量大的無 (低) 表決權股；B 多半是成交稀少的高表決權股，排最後
+# CSV 的市值 = 股價 × 全部股數，各股別幾乎相同，不能拿來判斷哪一檔比較活躍
+CLASS_PREFERENCE = ("K", "A", "C", "L", "", "B")
+
+# --- 1. 編譯 ---
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""): h.update(chunk)
+    return h.hexdigest()
+
+def _close(a, b, tol):
+    return abs(a - b) <= tol * max(abs(a), abs(b))
+
+def _preferred(group, tickers):
+    # group: 同公司各股別的索引；依 CLASS_PREFERENCE 挑出要保留的那一檔 (同順位取 CSV 較前面的)
+    stem = os.path.commonprefix([tickers[i] for i in group])
+    rank = lambda i: (CLASS_PREFERENCE.index(tickers[i][len(stem):]) if tickers[i][len(stem):] in CLASS_PREFERENCE else len(CLASS_PREFERENCE), i)
+    return min(group, key=rank)
+
+def _share_classes(tickers, price, cap):
+    # 回傳 primary[i]：i 是其他股別的重複時指向保留的那一檔，否則為 i 本身
+    by_stem = {}
+    for i, t in enumerate(tickers):
+        if len(t) > 1 and t[-1] in CLASS_LETTERS: by_stem.setdefault(t[:-1], []).append(i)   # LBRDA/LBRDK -> LBRD
+    index = {t: i for i, t in enumerate(tickers)}
+    primary = np.arange(len(tickers))
+    for i, t in enumerate(tickers):
+        group = set(by_stem.get(t, []))                                            # GOOG -> GOOGL
+        if t[-1] in CLASS_LETTERS:
+            group.update(by_stem.get(t[:-1], []))
+            if t[:-1] in index: group.add(index[t[:-1]])
+        group.discard(i)
+        for j in group:
+            if not (_close(price[i], price[j], DUP_PRICE_TOL) and _close(cap[i], cap[j], DUP_CAP_TOL)): continue
+            primary[primary == primary[j]] = primary[i]     # 先併成同一組，最後再決定保留哪一檔
+    for root in np.unique(primary):
+        group = np.flatnonzero(primary == root).tolist()
+        if len(group) > 1: primary[group] = _preferred(group, tickers)
+    return primary
+
+def compile_csv(path=CSV_FILE):
+    df = pd.read_csv(path)
+    df = df.dropna(subset=['Stock Ticker'])
+    tickers = df['Stock Ticker'].astype(str).str.strip().str.upper().to_numpy()
+    cap = pd.to_numeric(df['Market Cap'], errors="coerce").to_numpy(dtype=float)
+    price = pd.to_numeric(df['Stock Price'], errors="coerce").to_numpy(dtype=float)
+    codes, industries = pd.factorize(df['Industry'].fillna(""), sort=True)
+    cap_key = np.nan_to_num(cap, nan=-1.0)          # 沒有市值的排最前面，任何區間都不會選到
+    cap_order = np.argsort(cap_key, kind="stable")
+    return {
+        "version": FORMAT_VERSION,
+        "tickers": tickers,
+        "cap": cap,
+        "price": price,
+        "industry": codes.astype(np.int16),
+        "industries": list(industries),
+        "cap_order": cap_order,                      # 市值排序後的索引 → 區間查詢用 searchsorted
+        "cap_sorted": cap_key[cap_order],
+        "primary": _share_classes(list(tickers), price, cap),
+    }
+
+# --- 2. 查詢 ---
+class Universe:
+    def __init__(self, data):
+        self.__dict__.update(data)
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def cap_mask(self, lo=None, hi=None):
+        # 市值排序陣列上二分搜尋區間 [lo, hi)，不逐筆比較
+        a = 0 if lo is None else np.searchsorted(self.cap_sorted, lo, side="left")
+        b = len(self.cap_sorted) if hi is None else np.searchsorted(self.cap_sorted, hi, side="left")
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.cap_order[a:b]] = True
+        return mask
+
+    def industry_codes(self, patterns):
+        # 產業名稱部分比對 (不分大小寫)，例如 "semiconductor"
+        pats = [p.upper() for p in patterns]
+        return [i for i, name in enumerate(self.industries) if name and any(p in name.upper() for p in pats)]
+
+    def mask(self, bands=None, min_cap=None, max_cap=None, min_price=None, max_price=None, industries=None, dedupe=True):
+        m = np.ones(len(self), dtype=bool)
+        if bands:
+            band = np.zeros(len(self), dtype=bool)
+            for b in bands: band |= self.cap_mask(*CAP_BANDS[b])
+            m &= band
+        if min_cap is not None or max_cap is not None: m &= self.cap_mask(min_cap, max_cap)
+        with np.errstate(invalid="ignore"):
+            if min_price is not None: m &= self.price >= min_price
+            if max_price is not None: m &= self.price <= max_price
+        if industries: m &= np.isin(self.industry, self.industry_codes(industries))
+        if dedupe: m &= self.primary == np.arange(len(self))
+        return m
+
+    def select(self, **kw):
+        # 依 CSV 原本順序 (市值由大到小) 回傳代號
+        return self.tickers[self.mask(**kw)].tolist()
+
+    def duplicates(self):
+        # [(保留, 被合併)]
+        return [(self.tickers[p], self.tickers[i]) for i, p in enumerate(self.primary) if p != i]
+
+    def info(self, ticker):
+        i = self.index.get(ticker.upper())
+        if i is None: return None
+        return {"ticker": self.tickers[i], "market_cap": self.cap[i], "price": self.price[i],
+                "industry": self.industries[self.industry[i]] or None, "primary": self.tickers[self.primary[i]]}
+
+def load(path=CSV_FILE, cache=CACHE_FILE):
+    digest = _file_hash(path)
+    try:
+        with open(cache, "rb") as f: blob = pickle.load(f)
+        if blob.get("hash") == digest and blob["data"].get("version") == FORMAT_VERSION: return Universe(blob["data"])
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError, AttributeError): pass
+    data = compile_csv(path)
+    try:
+        if os.path.dirname(cache): os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(cache, "wb") as f: pickle.dump({"hash": digest, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"⚠️ 股票池快取寫入失敗: {e}")
+    return Universe(data)
+
+# --- 3. 命令列 ---
+def add_arguments(ap):
+    ap.add_argument("--cap", nargs="+", choices=list(CAP_BANDS), help="市值區間")
+    ap.add_argument("--min-price", type=float)
+    ap.add_argument("--max-price", type=float)
+    ap.add_argument("--industry", nargs="+", help="產業關鍵字 (部分比對)")
+    ap.add_argument("--keep-dups", action="store_true", help="保留同公司的其他股別")
+
+def select_args(u, args):
+    return u.select(bands=args.cap, min_price=args.min_price, max_price=args.max_price,
+                    industries=args.industry, dedupe=not args.keep_dups)
+
+def main():
+    ap = argparse.ArgumentParser(description="股票池篩選")
+    ap.add_argument("--csv", default=CSV_FILE)
+    add_arguments(ap)
+    ap.add_argument("--dups", action="store_true", help="列出被合併的股別")
+    args = ap.parse_args()
+    if not os.path.exists(args.csv):
+        print(f"❌ 找不到 {args.csv}")
+        sys.exit(1)
+    u = load(args.csv)
+    if args.dups:
+        for keep, drop in u.duplicates(): print(f"{drop:<6} -> {keep}")
+        return
+    for t in select_args(u, args): print(t)
+
+if __name__ == "__main__":
+    main()